@@ -1,383 +1,489 @@
-from typing import Any, Dict, List, Optional
-
-from zai import ZhipuAiClient
-
-
-class AIGenerator:
-    """Handles interactions with Zhipu AI's GLM-4.5 API for generating responses"""
-
-    # Static system prompt to avoid rebuilding on each call
-    SYSTEM_PROMPT = """ You are an AI assistant specialized in course materials and educational content with access to comprehensive search tools for course information.
-
-Available Tools:
-1. **search_course_content** - Search for specific course content and materials
-2. **get_course_outline** - Get course outline including title, link, and complete lesson list
-
-Tool Usage Guidelines:
-- **Use search_course_content** for questions about specific course content, concepts, or detailed educational materials
-- **Use get_course_outline** for questions about course structure, lesson lists, or course overview information
-- **Multiple tool use allowed** - Use up to 2 tool calls sequentially for complex queries
-- **Each tool call is a separate interaction** - You can see tool results before deciding on additional calls
-- **Use tools strategically** - Plan your tool usage to gather all necessary information efficiently
-- Synthesize tool results into accurate, fact-based responses
-- If tools yield no results, state this clearly without offering alternatives
-
-Examples of Sequential Tool Usage:
-
-Example 1: Comparing courses
-- User: "Find a course that covers similar topics to lesson 3 of course X"
-- Step 1: Use get_course_outline to find lesson 3 topic
-- Step 2: Use search_course_content to find similar courses
-
-Example 2: Comprehensive analysis
-- User: "What are the prerequisites for course X and what courses build on it?"
-- Step 1: Use get_course_outline for course X structure
-- Step 2: Use search_course_content to find related/prerequisite courses
-
-Example 3: Multi-lesson research
-- User: "Compare the teaching approaches in lesson 5 of course A and lesson 8 of course B"
-- Step 1: Use get_course_outline for course A
-- Step 2: Use get_lesson_content for lesson 5
-- Step 3: Use get_course_outline for course B
-- Step 4: Use get_lesson_content for lesson 8
-
-When to Use Multiple Tools:
-- When you need information from multiple courses or lessons
-- When you need to compare or contrast different materials
-- When the first tool result suggests additional research is needed
-- When answering complex questions that require comprehensive analysis
-
-When to Stop After One Tool:
-- When the single tool result fully answers the question
-- When the question is simple and direct
-- When additional tools would not provide more relevant information
-
-Response Protocol:
-- **General knowledge questions**: Answer using existing knowledge without using tools
-- **Course content questions**: Use search_course_content tool first, then use additional tools if needed
-- **Course outline/structure questions**: Use get_course_outline tool first, then use additional tools if needed
-- **Complex multi-part questions**: Use multiple tools sequentially to gather comprehensive information
-- **No meta-commentary**:
- - Provide direct answers only — no reasoning process, tool explanations, or question-type analysis
- - Do not mention "based on the search results" or "based on the tool output"
-
-For course outline queries, ensure your response includes:
-- Course title
-- Course link
-- Complete lesson list with lesson numbers and titles
-- Instructor information if available
-
-All responses must be:
-1. **Brief, Concise and focused** - Get to the point quickly
-2. **Educational** - Maintain instructional value
-3. **Clear** - Use accessible language
-4. **Example-supported** - Include relevant examples when they aid understanding
-Provide only the direct answer to what was asked.
-"""
-
-    def __init__(self, api_key: str, model: str):
-        self.client = ZhipuAiClient(api_key=api_key)
-        self.model = model
-
-        # Pre-build base API parameters
-        self.base_params = {"model": self.model, "temperature": 0, "max_tokens": 800}
-
-    def generate_response(
-        self,
-        query: str,
-        conversation_history: Optional[str] = None,
-        tools: Optional[List] = None,
-        tool_manager=None,
-        max_rounds: int = 2,
-    ) -> str:
-        """
-        Generate AI response with up to max_rounds sequential tool calls.
-
-        Args:
-            query: The user's question or request
-            conversation_history: Previous messages for context
-            tools: Available tools the AI can use
-            tool_manager: Manager to execute tools
-            max_rounds: Maximum number of sequential tool rounds (default: 2)
-
-        Returns:
-            Generated response as string
-        """
-        # Build initial messages
-        messages = self._build_initial_messages(query, conversation_history)
-
-        # Start recursive execution
-        return self._execute_round(messages, tools, tool_manager, 0, max_rounds)
-
-    def _execute_round(
-        self,
-        messages: List[Dict],
-        tools: Optional[List],
-        tool_manager,
-        round_num: int,
-        max_rounds: int,
-    ) -> str:
-        """
-        Execute one round of conversation recursively.
-
-        Args:
-            messages: Current message history
-            tools: Tools available for this round
-            tool_manager: Tool manager instance
-            round_num: Current round number
-            max_rounds: Maximum allowed rounds
-
-        Returns:
-            Final response string
-        """
-        # Build API parameters for this round
-        api_params = self._build_api_params(messages, tools, round_num)
-
-        # Make API call
-        try:
-            response = self._make_api_call(api_params)
-        except Exception as e:
-            return f"API调用错误: {str(e)}"
-
-        # Check termination conditions
-        if self._should_terminate(response, round_num, max_rounds, tool_manager):
-            return response.choices[0].message.content
-
-        # Execute tools and update messages
-        try:
-            updated_messages = self._execute_tools_and_update(
-                response, messages, tool_manager
-            )
-        except Exception as e:
-            return f"工具执行错误: {str(e)}"
-
-        # Recurse for next round
-        return self._execute_round(
-            updated_messages, None, tool_manager, round_num + 1, max_rounds
-        )
-
-    def _build_initial_messages(
-        self, query: str, conversation_history: Optional[str] = None
-    ) -> List[Dict]:
-        """
-        Build initial message array with system prompt and user query.
-
-        Args:
-            query: User's query
-            conversation_history: Previous conversation context
-
-        Returns:
-            List of message dictionaries
-        """
-        system_content = (
-            f"{self.SYSTEM_PROMPT}\n\nPrevious conversation:\n{conversation_history}"
-            if conversation_history
-            else self.SYSTEM_PROMPT
-        )
-
-        return [
-            {"role": "system", "content": system_content},
-            {"role": "user", "content": query},
-        ]
-
-    def _build_api_params(
-        self, messages: List[Dict], tools: Optional[List], round_num: int
-    ) -> Dict:
-        """
-        Build API parameters for the current round.
-
-        Args:
-            messages: Message history
-            tools: Available tools
-            round_num: Current round number
-
-        Returns:
-            API parameters dictionary
-        """
-        api_params = {**self.base_params, "messages": messages}
-
-        # Only include tools in first round
-        if round_num == 0 and tools:
-            api_params["tools"] = tools
-            api_params["tool_choice"] = "auto"
-
-        return api_params
-
-    def _make_api_call(self, api_params: Dict) -> Any:
-        """
-        Make API call to GLM-4.5.
-
-        Args:
-            api_params: API parameters
-
-        Returns:
-            API response
-        """
-        return self.client.chat.completions.create(**api_params)
-
-    def _should_terminate(
-        self, response, round_num: int, max_rounds: int, tool_manager
-    ) -> bool:
-        """
-        Check if recursion should terminate.
-
-        Args:
-            response: API response
-            round_num: Current round number
-            max_rounds: Maximum allowed rounds
-            tool_manager: Tool manager instance
-
-        Returns:
-            True if should terminate, False otherwise
-        """
-        # Reached maximum rounds
-        if round_num >= max_rounds:
-            return True
-
-        # Response has no tool calls
-        if response.choices[0].finish_reason != "tool_calls":
-            return True
-
-        # No tool manager available
-        if not tool_manager:
-            return True
-
-        # No tool calls in response
-        if not response.choices[0].message.tool_calls:
-            return True
-
-        return False
-
-    def _execute_tools_and_update(
-        self, response, messages: List[Dict], tool_manager
-    ) -> List[Dict]:
-        """
-        Execute tool calls and update message history.
-
-        Args:
-            response: API response with tool calls
-            messages: Current message history
-            tool_manager: Tool manager instance
-
-        Returns:
-            Updated message history
-        """
-        # Copy messages to avoid modifying original
-        updated_messages = messages.copy()
-
-        # Add assistant message with tool calls
-        assistant_message = {
-            "role": "assistant",
-            "content": response.choices[0].message.content,
-            "tool_calls": response.choices[0].message.tool_calls,
-        }
-        updated_messages.append(assistant_message)
-
-        # Execute all tool calls
-        for tool_call in response.choices[0].message.tool_calls:
-            tool_result = self._execute_single_tool(tool_call, tool_manager)
-
-            # Add tool result message
-            updated_messages.append(
-                {"tool_call_id": tool_call.id, "role": "tool", "content": tool_result}
-            )
-
-        return updated_messages
-
-    def _execute_single_tool(self, tool_call, tool_manager) -> str:
-        """
-        Execute a single tool call.
-
-        Args:
-            tool_call: Tool call object
-            tool_manager: Tool manager instance
-
-        Returns:
-            Tool execution result
-        """
-        try:
-            # Parse tool arguments
-            tool_args = self._parse_tool_args(tool_call.function.arguments)
-
-            # Execute tool
-            result = tool_manager.execute_tool(tool_call.function.name, **tool_args)
-
-            return result
-        except Exception as e:
-            return f"工具执行失败: {tool_call.function.name} - {str(e)}"
-
-    def _parse_tool_args(self, arguments_str: str) -> Dict:
-        """
-        Parse tool arguments from string.
-
-        Args:
-            arguments_str: Arguments as JSON string
-
-        Returns:
-            Parsed arguments dictionary
-        """
-        try:
-            import json
-
-            return json.loads(arguments_str)
-        except (json.JSONDecodeError, TypeError):
-            # Fallback to eval if JSON parsing fails
-            return eval(arguments_str)
-
-    def _handle_tool_execution(
-        self, initial_response, base_params: Dict[str, Any], tool_manager
-    ):
-        """
-        Legacy method for backward compatibility.
-
-        Args:
-            initial_response: Response containing tool use requests
-            base_params: Base API parameters
-            tool_manager: Manager to execute tools
-
-        Returns:
-            Final response text after tool execution
-        """
-        # Start with existing messages
-        messages = base_params["messages"].copy()
-
-        # Add AI's tool use response
-        assistant_message = {
-            "role": "assistant",
-            "content": initial_response.choices[0].message.content,
-            "tool_calls": initial_response.choices[0].message.tool_calls,
-        }
-        messages.append(assistant_message)
-
-        # Execute all tool calls and collect results
-        tool_results = []
-        for tool_call in initial_response.choices[0].message.tool_calls:
-            # Parse tool arguments safely
-            try:
-                import json
-
-                tool_args = json.loads(tool_call.function.arguments)
-            except (json.JSONDecodeError, TypeError):
-                # Fallback to eval if JSON parsing fails
-                tool_args = eval(tool_call.function.arguments)
-
-            tool_result = tool_manager.execute_tool(
-                tool_call.function.name, **tool_args
-            )
-
-            tool_results.append(
-                {"tool_call_id": tool_call.id, "role": "tool", "content": tool_result}
-            )
-
-        # Add tool results to messages
-        messages.extend(tool_results)
-
-        # Prepare final API call without tools
-        final_params = {
-            **self.base_params,
-            "messages": messages,  # 移除system参数，直接使用messages
-        }
-
-        # Get final response
-        final_response = self.client.chat.completions.create(**final_params)
-        return final_response.choices[0].message.content
+import asyncio
+import functools
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+from zai import ZhipuAiClient
+
+# Prefer orjson for parsing tool-call arguments (2-5x faster than stdlib json);
+# fall back to the stdlib when it is not installed
+try:
+    import orjson
+
+    _json_loads_impl = orjson.loads
+except ImportError:
+    _json_loads_impl = json.loads
+
+
+@functools.lru_cache(maxsize=8)
+def _get_client(api_key: str) -> ZhipuAiClient:
+    """Share one client (and its HTTP connection pool) per distinct API key"""
+    return ZhipuAiClient(api_key=api_key)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_tool_args_cached(arguments_str: str) -> Dict:
+    """Parse a tool-call argument string, memoized on the raw string.
+
+    Models frequently re-emit identical argument payloads (retries, repeated
+    tool rounds), so caching skips the parse on repeats. Callers must not
+    mutate the returned dict; the hot path only splats it into kwargs.
+    """
+    return _json_loads_impl(arguments_str)
+
+
+class AIGenerator:
+    """Handles interactions with Zhipu AI's GLM-4.5 API for generating responses"""
+
+    # Maximum number of cached API responses to keep in memory
+    RESPONSE_CACHE_SIZE = 512
+
+    # Upper bound on provider calls in flight from generate_response_async
+    MAX_CONCURRENT_REQUESTS = 8
+
+    # Static system prompt to avoid rebuilding on each call; interned so
+    # identity comparisons and dict hashing on it are O(1)
+    SYSTEM_PROMPT = sys.intern(
+        """ You are an AI assistant specialized in course materials and educational content with access to comprehensive search tools for course information.
+
+Available Tools:
+1. **search_course_content** - Search for specific course content and materials
+2. **get_course_outline** - Get course outline including title, link, and complete lesson list
+
+Tool Usage Guidelines:
+- **Use search_course_content** for questions about specific course content, concepts, or detailed educational materials
+- **Use get_course_outline** for questions about course structure, lesson lists, or course overview information
+- **Multiple tool use allowed** - Use up to 2 tool calls sequentially for complex queries
+- **Each tool call is a separate interaction** - You can see tool results before deciding on additional calls
+- **Use tools strategically** - Plan your tool usage to gather all necessary information efficiently
+- Synthesize tool results into accurate, fact-based responses
+- If tools yield no results, state this clearly without offering alternatives
+
+Examples of Sequential Tool Usage:
+
+Example 1: Comparing courses
+- User: "Find a course that covers similar topics to lesson 3 of course X"
+- Step 1: Use get_course_outline to find lesson 3 topic
+- Step 2: Use search_course_content to find similar courses
+
+Example 2: Comprehensive analysis
+- User: "What are the prerequisites for course X and what courses build on it?"
+- Step 1: Use get_course_outline for course X structure
+- Step 2: Use search_course_content to find related/prerequisite courses
+
+Example 3: Multi-lesson research
+- User: "Compare the teaching approaches in lesson 5 of course A and lesson 8 of course B"
+- Step 1: Use get_course_outline for course A
+- Step 2: Use get_lesson_content for lesson 5
+- Step 3: Use get_course_outline for course B
+- Step 4: Use get_lesson_content for lesson 8
+
+When to Use Multiple Tools:
+- When you need information from multiple courses or lessons
+- When you need to compare or contrast different materials
+- When the first tool result suggests additional research is needed
+- When answering complex questions that require comprehensive analysis
+
+When to Stop After One Tool:
+- When the single tool result fully answers the question
+- When the question is simple and direct
+- When additional tools would not provide more relevant information
+
+Response Protocol:
+- **General knowledge questions**: Answer using existing knowledge without using tools
+- **Course content questions**: Use search_course_content tool first, then use additional tools if needed
+- **Course outline/structure questions**: Use get_course_outline tool first, then use additional tools if needed
+- **Complex multi-part questions**: Use multiple tools sequentially to gather comprehensive information
+- **No meta-commentary**:
+ - Provide direct answers only — no reasoning process, tool explanations, or question-type analysis
+ - Do not mention "based on the search results" or "based on the tool output"
+
+For course outline queries, ensure your response includes:
+- Course title
+- Course link
+- Complete lesson list with lesson numbers and titles
+- Instructor information if available
+
+All responses must be:
+1. **Brief, Concise and focused** - Get to the point quickly
+2. **Educational** - Maintain instructional value
+3. **Clear** - Use accessible language
+4. **Example-supported** - Include relevant examples when they aid understanding
+Provide only the direct answer to what was asked.
+"""
+    )
+
+    # Cached so trimming/budgeting logic never re-measures the prompt
+    _SYSTEM_PROMPT_LEN = len(SYSTEM_PROMPT)
+
+    def __init__(self, api_key: str, model: str):
+        self.client = _get_client(api_key)
+        self.model = model
+
+        # Pre-build base API parameters so each request starts from one
+        # ready-made dict instead of reassembling the constants per call
+        self.base_params = {
+            "model": self.model,
+            "temperature": 0,
+            "max_tokens": 800,
+        }
+
+        # Reusable template for per-round API params; _build_api_params copies
+        # this (a single C-level allocation) instead of unpacking base_params
+        self._api_params_template = dict(self.base_params)
+
+        # Pre-build the system message for the common no-history case so the
+        # large prompt string is not re-assembled on every request
+        # (downstream code never mutates this dict)
+        self._system_msg_no_history = {
+            "role": "system",
+            "content": self.SYSTEM_PROMPT,
+        }
+
+        # LRU cache of API responses; safe because calls run with temperature=0,
+        # making responses deterministic for identical parameters. The lock
+        # keeps lookups and eviction consistent when generate_response_async
+        # runs calls concurrently in worker threads
+        self._resp_cache: OrderedDict[bytes, Any] = OrderedDict()
+        self._resp_cache_lock = threading.Lock()
+
+        # Bounds how many provider calls generate_response_async keeps in flight
+        self._request_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+
+        # Pool for running independent tool calls from one response in parallel
+        self._tool_pool = ThreadPoolExecutor(max_workers=4)
+
+    def generate_response(
+        self,
+        query: str,
+        conversation_history: Optional[str] = None,
+        tools: Optional[List] = None,
+        tool_manager=None,
+        max_rounds: int = 2,
+    ) -> str:
+        """
+        Generate AI response with up to max_rounds sequential tool calls.
+
+        Args:
+            query: The user's question or request
+            conversation_history: Previous messages for context
+            tools: Available tools the AI can use
+            tool_manager: Manager to execute tools
+            max_rounds: Maximum number of sequential tool rounds (default: 2)
+
+        Returns:
+            Generated response as string
+        """
+        # Build initial messages
+        messages = self._build_initial_messages(query, conversation_history)
+
+        # Execute tool rounds iteratively, mutating a single message list
+        round_num = 0
+        while True:
+            # Build API parameters for this round
+            api_params = self._build_api_params(messages, tools, round_num)
+
+            # Make API call
+            try:
+                response = self._make_api_call(api_params)
+            except Exception as e:
+                return f"API调用错误: {str(e)}"
+
+            # Check termination conditions
+            if self._should_terminate(response, round_num, max_rounds, tool_manager):
+                return response.choices[0].message.content
+
+            # Execute tools and update messages in place
+            try:
+                self._append_tool_results(messages, response, tool_manager)
+            except Exception as e:
+                return f"工具执行错误: {str(e)}"
+
+            round_num += 1
+
+    async def generate_response_async(
+        self,
+        query: str,
+        conversation_history: Optional[str] = None,
+        tools: Optional[List] = None,
+        tool_manager=None,
+        max_rounds: int = 2,
+    ) -> str:
+        """
+        Async entry point for concurrent callers.
+
+        The Zhipu SDK only exposes a blocking client, so each call runs in a
+        worker thread; concurrent queries overlap their network round trips
+        instead of serializing, bounded by MAX_CONCURRENT_REQUESTS.
+
+        Args:
+            query: The user's question or request
+            conversation_history: Previous messages for context
+            tools: Available tools the AI can use
+            tool_manager: Manager to execute tools
+            max_rounds: Maximum number of sequential tool rounds (default: 2)
+
+        Returns:
+            Generated response as string
+        """
+        async with self._request_semaphore:
+            return await asyncio.to_thread(
+                self.generate_response,
+                query,
+                conversation_history,
+                tools,
+                tool_manager,
+                max_rounds,
+            )
+
+    def generate_response_stream(
+        self,
+        query: str,
+        conversation_history: Optional[str] = None,
+        tools: Optional[List] = None,
+        tool_manager=None,
+        max_rounds: int = 2,
+    ) -> Iterator[str]:
+        """
+        Generate a response, yielding content as it arrives.
+
+        Tool rounds keep the blocking endpoint (tool_calls arrive atomically),
+        so only the final synthesis call streams token deltas. Cuts
+        time-to-first-token for long answers; suitable for wrapping in a
+        FastAPI StreamingResponse.
+
+        Args:
+            query: The user's question or request
+            conversation_history: Previous messages for context
+            tools: Available tools the AI can use
+            tool_manager: Manager to execute tools
+            max_rounds: Maximum number of sequential tool rounds (default: 2)
+
+        Yields:
+            Response content fragments as strings
+        """
+        messages = self._build_initial_messages(query, conversation_history)
+
+        # Tools are only offered in round 0, so at most one blocking tool
+        # round precedes the streamed synthesis call
+        if tools and tool_manager:
+            api_params = self._build_api_params(messages, tools, 0)
+            try:
+                response = self._make_api_call(api_params)
+            except Exception as e:
+                yield f"API调用错误: {str(e)}"
+                return
+
+            if self._should_terminate(response, 0, max_rounds, tool_manager):
+                # Model answered directly; nothing left to stream
+                yield response.choices[0].message.content
+                return
+
+            try:
+                self._append_tool_results(messages, response, tool_manager)
+            except Exception as e:
+                yield f"工具执行错误: {str(e)}"
+                return
+
+        # Final synthesis round streams token deltas
+        stream_params = self._build_api_params(messages, None, 1)
+        stream_params["stream"] = True
+        try:
+            stream = self.client.chat.completions.create(**stream_params)
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        except Exception as e:
+            yield f"API调用错误: {str(e)}"
+
+    def _build_initial_messages(
+        self, query: str, conversation_history: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Build initial message array with system prompt and user query.
+
+        Args:
+            query: User's query
+            conversation_history: Previous conversation context
+
+        Returns:
+            List of message dictionaries
+        """
+        if not conversation_history:
+            return [
+                self._system_msg_no_history,
+                {"role": "user", "content": query},
+            ]
+
+        system_content = (
+            f"{self.SYSTEM_PROMPT}\n\nPrevious conversation:\n{conversation_history}"
+        )
+
+        return [
+            {"role": "system", "content": system_content},
+            {"role": "user", "content": query},
+        ]
+
+    def _build_api_params(
+        self, messages: List[Dict], tools: Optional[List], round_num: int
+    ) -> Dict:
+        """
+        Build API parameters for the current round.
+
+        Args:
+            messages: Message history
+            tools: Available tools
+            round_num: Current round number
+
+        Returns:
+            API parameters dictionary
+        """
+        api_params = self._api_params_template.copy()
+        api_params["messages"] = messages
+
+        # Only include tools in first round
+        if round_num == 0 and tools:
+            api_params["tools"] = tools
+            api_params["tool_choice"] = "auto"
+
+        return api_params
+
+    def _params_key(self, api_params: Dict) -> bytes:
+        """Build a stable cache key from the full API parameter dict"""
+        serialized = json.dumps(api_params, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode()).digest()
+
+    def _make_api_call(self, api_params: Dict) -> Any:
+        """
+        Make API call to GLM-4.5, serving repeat calls from an LRU cache.
+
+        Args:
+            api_params: API parameters
+
+        Returns:
+            API response
+        """
+        key = self._params_key(api_params)
+        with self._resp_cache_lock:
+            cached = self._resp_cache.get(key)
+            if cached is not None:
+                self._resp_cache.move_to_end(key)
+                return cached
+
+        # The provider call itself runs unlocked so concurrent requests
+        # still overlap; a duplicate call for the same key is harmless
+        response = self.client.chat.completions.create(**api_params)
+
+        with self._resp_cache_lock:
+            self._resp_cache[key] = response
+            if len(self._resp_cache) > self.RESPONSE_CACHE_SIZE:
+                self._resp_cache.popitem(last=False)
+        return response
+
+    def _should_terminate(
+        self, response, round_num: int, max_rounds: int, tool_manager
+    ) -> bool:
+        """
+        Check if recursion should terminate.
+
+        Args:
+            response: API response
+            round_num: Current round number
+            max_rounds: Maximum allowed rounds
+            tool_manager: Tool manager instance
+
+        Returns:
+            True if should terminate, False otherwise
+        """
+        # Stop when out of rounds or nothing can execute tools; otherwise
+        # continue only if the response actually requested tool calls
+        if round_num >= max_rounds or not tool_manager:
+            return True
+
+        choice = response.choices[0]
+        return choice.finish_reason != "tool_calls" or not choice.message.tool_calls
+
+    def _append_tool_results(
+        self, messages: List[Dict], response, tool_manager
+    ) -> None:
+        """
+        Execute tool calls and append results to the message history in place.
+
+        Args:
+            messages: Current message history (mutated in place)
+            response: API response with tool calls
+            tool_manager: Tool manager instance
+        """
+        message = response.choices[0].message
+        tool_calls = message.tool_calls
+
+        # Add assistant message with tool calls
+        assistant_message = {
+            "role": "assistant",
+            "content": message.content,
+            "tool_calls": tool_calls,
+        }
+        messages.append(assistant_message)
+
+        # Execute all tool calls and append results in one batch. Tool calls
+        # within one response are independent and I/O-bound (vector store
+        # queries), so run them in parallel while preserving result order.
+        if len(tool_calls) == 1:
+            results = [self._execute_single_tool(tool_calls[0], tool_manager)]
+        else:
+            futures = [
+                self._tool_pool.submit(
+                    self._execute_single_tool, tool_call, tool_manager
+                )
+                for tool_call in tool_calls
+            ]
+            results = [future.result() for future in futures]
+
+        messages.extend(
+            {"tool_call_id": tool_call.id, "role": "tool", "content": result}
+            for tool_call, result in zip(tool_calls, results)
+        )
+
+    def _execute_single_tool(self, tool_call, tool_manager) -> str:
+        """
+        Execute a single tool call.
+
+        Args:
+            tool_call: Tool call object
+            tool_manager: Tool manager instance
+
+        Returns:
+            Tool execution result
+        """
+        try:
+            # Parse tool arguments
+            tool_args = self._parse_tool_args(tool_call.function.arguments)
+
+            # Dispatch through execute_tool (not the tool's execute directly)
+            # so name resolution and source tracking keep working
+            return tool_manager.execute_tool(tool_call.function.name, **tool_args)
+        except Exception as e:
+            return f"工具执行失败: {tool_call.function.name} - {str(e)}"
+
+    def _parse_tool_args(self, arguments_str: str) -> Dict:
+        """
+        Parse tool arguments from string.
+
+        Args:
+            arguments_str: Arguments as JSON string
+
+        Returns:
+            Parsed arguments dictionary
+        """
+        try:
+            return _parse_tool_args_cached(arguments_str)
+        except (json.JSONDecodeError, TypeError) as e:
+            # Never eval model-emitted strings; surface malformed arguments
+            # as a tool execution error instead
+            raise ValueError(f"Invalid tool arguments: {e}") from e
@@ -21,37 +21,40 @@ class Tool(ABC):
 class CourseSearchTool(Tool):
     """Tool for searching course content with semantic course name matching"""
 
+    # Static schema shared by all instances; built once at class creation
+    TOOL_DEFINITION: Dict[str, Any] = {
+        "type": "function",  # 添加必需的type字段
+        "function": {
+            "name": "search_course_content",
+            "description": "Search course materials with smart course name matching and lesson filtering",
+            "parameters": {  # 智谱AI使用parameters而不是input_schema
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "What to search for in the course content",
+                    },
+                    "course_name": {
+                        "type": "string",
+                        "description": "Course title (partial matches work, e.g. 'MCP', 'Introduction')",
+                    },
+                    "lesson_number": {
+                        "type": "integer",
+                        "description": "Specific lesson number to search within (e.g. 1, 2, 3)",
+                    },
+                },
+                "required": ["query"],
+            },
+        },
+    }
+
     def __init__(self, vector_store: VectorStore):
         self.store = vector_store
         self.last_sources = []  # Track sources from last search
 
     def get_tool_definition(self) -> Dict[str, Any]:
         """Return Zhipu AI tool definition for this tool"""
-        return {
-            "type": "function",  # 添加必需的type字段
-            "function": {
-                "name": "search_course_content",
-                "description": "Search course materials with smart course name matching and lesson filtering",
-                "parameters": {  # 智谱AI使用parameters而不是input_schema
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "What to search for in the course content",
-                        },
-                        "course_name": {
-                            "type": "string",
-                            "description": "Course title (partial matches work, e.g. 'MCP', 'Introduction')",
-                        },
-                        "lesson_number": {
-                            "type": "integer",
-                            "description": "Specific lesson number to search within (e.g. 1, 2, 3)",
-                        },
-                    },
-                    "required": ["query"],
-                },
-            },
-        }
+        return self.TOOL_DEFINITION
 
     def execute(
         self,
@@ -130,29 +133,32 @@ class CourseSearchTool(Tool):
 class CourseOutlineTool(Tool):
     """Tool for retrieving course outlines with lesson information"""
 
+    # Static schema shared by all instances; built once at class creation
+    TOOL_DEFINITION: Dict[str, Any] = {
+        "type": "function",
+        "function": {
+            "name": "get_course_outline",
+            "description": "Get course outline including title, link, and complete lesson list",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "course_title": {
+                        "type": "string",
+                        "description": "Course title to get outline for (partial matches work)",
+                    }
+                },
+                "required": ["course_title"],
+            },
+        },
+    }
+
     def __init__(self, vector_store: VectorStore):
         self.store = vector_store
         self.last_sources = []  # Track sources from last outline query
 
     def get_tool_definition(self) -> Dict[str, Any]:
         """Return Zhipu AI tool definition for this tool"""
-        return {
-            "type": "function",
-            "function": {
-                "name": "get_course_outline",
-                "description": "Get course outline including title, link, and complete lesson list",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "course_title": {
-                            "type": "string",
-                            "description": "Course title to get outline for (partial matches work)",
-                        }
-                    },
-                    "required": ["course_title"],
-                },
-            },
-        }
+        return self.TOOL_DEFINITION
 
     def execute(self, course_title: str) -> str:
         """
@@ -183,10 +189,10 @@ class CourseOutlineTool(Tool):
             instructor = metadata.get("instructor", "Unknown instructor")
 
             # Parse lessons from JSON
-            import json
+            import orjson
 
             lessons_json = metadata.get("lessons_json", "[]")
-            lessons = json.loads(lessons_json)
+            lessons = orjson.loads(lessons_json)
 
             # Format the outline
             outline = f"**{course_title}**\n\n"
@@ -218,10 +224,12 @@ class ToolManager:
 
     def __init__(self):
         self.tools = {}
+        self._definitions_cache: Optional[list] = None
 
     def register_tool(self, tool: Tool):
         """Register any tool that implements the Tool interface"""
         tool_def = tool.get_tool_definition()
+        self._definitions_cache = None
 
         # 适配智谱AI的工具定义格式
         if "function" in tool_def and "name" in tool_def["function"]:
@@ -236,7 +244,13 @@ class ToolManager:
 
     def get_tool_definitions(self) -> list:
         """Get all tool definitions for Zhipu AI tool calling"""
-        return [tool.get_tool_definition() for tool in self.tools.values()]
+        # Built once and invalidated on registration; the definitions are
+        # static per tool, so the list is safe to hand out repeatedly
+        if self._definitions_cache is None:
+            self._definitions_cache = [
+                tool.get_tool_definition() for tool in self.tools.values()
+            ]
+        return self._definitions_cache
 
     def execute_tool(self, tool_name: str, **kwargs) -> str:
         """Execute a tool by name with given parameters"""
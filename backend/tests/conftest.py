@@ -1,24 +1,18 @@
-import os
-import sys
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 import pytest
-from unittest.mock import AsyncMock, MagicMock
-from fastapi.testclient import TestClient
 
-# Add the backend directory to the Python path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# The backend directory is on sys.path via pythonpath in pyproject.toml
+from fakes import FakeCompletions
 
-from ai_generator import AIGenerator
-from config import config
-from document_processor import DocumentProcessor
-from models import Course, CourseChunk, Lesson
-from rag_system import RAGSystem
-from search_tools import CourseOutlineTool, CourseSearchTool, ToolManager
-from session_manager import SessionManager
-from vector_store import VectorStore
+# Heavy application imports (ChromaDB, sentence-transformers, the Zhipu SDK)
+# are deferred into the fixtures that need them so collection and tests that
+# only use lightweight fixtures don't pay the import cost.
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_course_data():
     """Sample course data for testing"""
     return {
@@ -58,64 +52,209 @@ Lesson Link: https://example.com/lesson2
 This lesson covers advanced topics and complex concepts for deeper understanding. Building on the foundation from lesson 1, students explore sophisticated techniques."""
 
 
-@pytest.fixture
-def mock_vector_store():
-    """Create a mock vector store for testing"""
-    # Use in-memory ChromaDB for testing
-    import shutil
-    import tempfile
+@pytest.fixture(autouse=True, scope="session")
+def _fast_embeddings():
+    """Replace the sentence-transformer embedding function suite-wide
+
+    Every store the tests build embeds with the deterministic hash stub
+    instead of loading the MiniLM model (~90MB download, multi-second
+    init) and running inference per query.
+    """
+    from chromadb.utils import embedding_functions
+
+    from fakes import FakeEmbeddingFunction
+
+    mp = pytest.MonkeyPatch()
+    mp.setattr(
+        embedding_functions,
+        "SentenceTransformerEmbeddingFunction",
+        lambda model_name=None: FakeEmbeddingFunction(),
+    )
+    yield
+    mp.undo()
 
-    temp_dir = tempfile.mkdtemp()
-    store = VectorStore(temp_dir, "all-MiniLM-L6-v2", max_results=5)
 
-    yield store
+@pytest.fixture(scope="session")
+def _session_vector_store():
+    """Session-wide in-memory vector store built once for the suite"""
+    from vector_store import VectorStore
 
-    # Cleanup
-    shutil.rmtree(temp_dir, ignore_errors=True)
+    return VectorStore(None, "all-MiniLM-L6-v2", max_results=5)
 
 
 @pytest.fixture
+def mock_vector_store(_session_vector_store):
+    """Create a mock vector store for testing"""
+    yield _session_vector_store
+
+    # Clear collections so the next test starts from an empty store
+    _session_vector_store.clear_all_data()
+
+
+@pytest.fixture(scope="session")
 def mock_document_processor():
     """Create a document processor for testing"""
+    from document_processor import DocumentProcessor
+
     return DocumentProcessor(chunk_size=100, chunk_overlap=20)
 
 
-@pytest.fixture
-def mock_ai_generator():
-    """Create a mock AI generator for testing"""
+@pytest.fixture(scope="module")
+def _module_ai_generator():
+    """Module-wide AI generator so each test module builds it only once"""
+    from ai_generator import AIGenerator
+
     # Use a dummy API key for testing
     return AIGenerator("test_api_key", "glm-4.5")
 
 
+@pytest.fixture
+def mock_ai_generator(_module_ai_generator):
+    """Create a mock AI generator for testing"""
+    # Reset the response cache so the shared generator stays test-isolated
+    _module_ai_generator._resp_cache.clear()
+    return _module_ai_generator
+
+
+@pytest.fixture
+def fake_create(mock_ai_generator):
+    """Install a FakeCompletions endpoint on the shared generator's client"""
+    completions = FakeCompletions()
+    original = mock_ai_generator.client.chat.completions
+    mock_ai_generator.client.chat.completions = completions
+    yield completions
+    mock_ai_generator.client.chat.completions = original
+
+
+@pytest.fixture(scope="module")
+def make_stop_response():
+    """Factory for fake completions that finish without tool calls
+
+    Uses SimpleNamespace rather than Mock: the code under test only reads
+    attributes, and namespaces skip Mock's lazy child creation and call
+    recording.
+    """
+
+    def _make(content):
+        return SimpleNamespace(
+            choices=[
+                SimpleNamespace(
+                    finish_reason="stop",
+                    message=SimpleNamespace(content=content, tool_calls=[]),
+                )
+            ]
+        )
+
+    return _make
+
+
+@pytest.fixture(scope="module")
+def make_tool_response():
+    """Factory for fake completions that request one or more tool calls
+
+    Each call is described by a (name, arguments, call_id) tuple.
+    """
+
+    def _make(*calls, content="I'll use a tool."):
+        tool_calls = [
+            SimpleNamespace(
+                id=call_id,
+                function=SimpleNamespace(name=name, arguments=arguments),
+            )
+            for name, arguments, call_id in calls
+        ]
+        return SimpleNamespace(
+            choices=[
+                SimpleNamespace(
+                    finish_reason="tool_calls",
+                    message=SimpleNamespace(content=content, tool_calls=tool_calls),
+                )
+            ]
+        )
+
+    return _make
+
+
+@pytest.fixture(scope="module")
+def make_stream_response():
+    """Factory for fake streaming completions yielding content deltas
+
+    Returns a list of chunk objects shaped like the SDK's stream events;
+    the code under test just iterates whatever create() hands back. Pass
+    ``error`` to get a generator that raises after the queued chunks,
+    simulating a connection dropped mid-stream.
+    """
+
+    def _make(*deltas, error=None):
+        chunks = [
+            SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))]
+            )
+            for delta in deltas
+        ]
+        if error is None:
+            return chunks
+
+        def _stream():
+            yield from chunks
+            raise error
+
+        return _stream()
+
+    return _make
+
+
 @pytest.fixture
 def mock_session_manager():
     """Create a session manager for testing"""
+    from session_manager import SessionManager
+
     return SessionManager(max_history=2)
 
 
-@pytest.fixture
-def mock_tool_manager(mock_vector_store):
-    """Create a tool manager with search tools for testing"""
+@pytest.fixture(scope="module")
+def _module_tool_manager(_session_vector_store):
+    """Module-wide tool manager so tool registration runs once per module"""
+    from search_tools import CourseOutlineTool, CourseSearchTool, ToolManager
+
     tool_manager = ToolManager()
-    search_tool = CourseSearchTool(mock_vector_store)
-    outline_tool = CourseOutlineTool(mock_vector_store)
-    tool_manager.register_tool(search_tool)
-    tool_manager.register_tool(outline_tool)
+    tool_manager.register_tool(CourseSearchTool(_session_vector_store))
+    tool_manager.register_tool(CourseOutlineTool(_session_vector_store))
     return tool_manager
 
 
 @pytest.fixture
-def mock_rag_system(
-    mock_vector_store,
-    mock_document_processor,
-    mock_ai_generator,
-    mock_session_manager,
-    mock_tool_manager,
-):
-    """Create a complete RAG system for testing"""
+def mock_tool_manager(_module_tool_manager):
+    """Create a tool manager with search tools for testing"""
+    # Undo per-test execute_tool replacements and tracked sources so the
+    # shared manager stays test-isolated
+    _module_tool_manager.__dict__.pop("execute_tool", None)
+    _module_tool_manager.reset_sources()
+    return _module_tool_manager
+
+
+@pytest.fixture(scope="module")
+def tool_definitions():
+    """Module-scoped tool definitions (the schemas are static)
+
+    Reads the class-level schemas directly; tests that execute tools
+    still go through mock_tool_manager.
+    """
+    from search_tools import CourseOutlineTool, CourseSearchTool
+
+    return [
+        CourseSearchTool.TOOL_DEFINITION,
+        CourseOutlineTool.TOOL_DEFINITION,
+    ]
+
+
+@pytest.fixture(scope="module")
+def _module_rag_system():
+    """Module-wide RAG system so the full component graph builds once"""
     from dataclasses import dataclass
+    from typing import Optional
 
-    from config import Config
+    from rag_system import RAGSystem
 
     # Create a test config
     @dataclass
@@ -127,12 +266,29 @@ def mock_rag_system(
         CHUNK_OVERLAP: int = 20
         MAX_RESULTS: int = 5
         MAX_HISTORY: int = 2
-        CHROMA_PATH: str = "./test_chroma_db"
+        # None selects the in-memory EphemeralClient, so test runs leave
+        # no ChromaDB directory behind
+        CHROMA_PATH: Optional[str] = None
 
-    test_config = TestConfig()
+    return RAGSystem(TestConfig())
 
-    # Create RAG system
-    rag_system = RAGSystem(test_config)
+
+@pytest.fixture
+def mock_rag_system(
+    _module_rag_system,
+    mock_vector_store,
+    mock_document_processor,
+    mock_ai_generator,
+    mock_session_manager,
+    mock_tool_manager,
+):
+    """Create a complete RAG system for testing
+
+    The RAGSystem itself is shared per module; each test gets freshly
+    reset components reattached, which keeps tests isolated without
+    rebuilding the whole graph.
+    """
+    rag_system = _module_rag_system
 
     # Replace components with mocks
     rag_system.vector_store = mock_vector_store
@@ -144,9 +300,39 @@ def mock_rag_system(
     return rag_system
 
 
-@pytest.fixture
-def populated_vector_store(mock_vector_store, sample_course_data):
-    """Vector store populated with sample course data"""
+@pytest.fixture(scope="session")
+def populated_vector_store(sample_course_data):
+    """Vector store populated with sample course data
+
+    Session-scoped and backed by the pure-Python fake Chroma client: no
+    embedding model load and no inference, just substring matching over
+    the sample corpus. The real Chroma path keeps one slow-marked
+    integration test in test_vector_store.py. Tests must treat this
+    store as read-only.
+    """
+    import vector_store as vector_store_module
+    from fakes import FakeChromaClient
+    from models import Course, CourseChunk, Lesson
+    from vector_store import VectorStore
+
+    # Swap in the fake client and skip the embedding function only while
+    # the store is constructed
+    mp = pytest.MonkeyPatch()
+    mp.setattr(
+        vector_store_module.chromadb,
+        "EphemeralClient",
+        lambda settings=None: FakeChromaClient(),
+    )
+    mp.setattr(
+        vector_store_module.chromadb.utils.embedding_functions,
+        "SentenceTransformerEmbeddingFunction",
+        lambda model_name=None: None,
+    )
+    try:
+        store = VectorStore(None, "all-MiniLM-L6-v2", max_results=5)
+    finally:
+        mp.undo()
+
     # Create course object
     course = Course(
         title=sample_course_data["title"],
@@ -175,27 +361,29 @@ def populated_vector_store(mock_vector_store, sample_course_data):
         chunks.append(chunk)
 
     # Add to vector store
-    mock_vector_store.add_course_metadata(course)
-    mock_vector_store.add_course_content(chunks)
-return mock_vector_store
+    store.add_course_metadata(course)
+    store.add_course_content(chunks)
+    return store
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def test_app():
-    """Create a test FastAPI app without static files"""
+    """Create a test FastAPI app without static files
+
+    Session-scoped: app construction (routing, middleware, Pydantic model
+    compilation) runs once; tests reset the mocked RAG system between runs.
+    """
     from fastapi import FastAPI, HTTPException
     from fastapi.middleware.cors import CORSMiddleware
     from fastapi.middleware.trustedhost import TrustedHostMiddleware
     from pydantic import BaseModel
     from typing import List, Optional
-    
+
     # Create test app without static files
     app = FastAPI(title="Test Course Materials RAG System", root_path="")
-    
+
     # Add middleware
-    app.add_middleware(
-        TrustedHostMiddleware,
-        allowed_hosts=["*"]
-    )
+    app.add_middleware(TrustedHostMiddleware, allowed_hosts=["*"])
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -204,7 +392,7 @@ def test_app():
         allow_headers=["*"],
         expose_headers=["*"],
     )
-    
+
     # Pydantic models for request/response
     class QueryRequest(BaseModel):
         query: str
@@ -225,21 +413,21 @@ def test_app():
     class ClearSessionResponse(BaseModel):
         success: bool
         message: str
-    
+
     # Mock RAG system
     mock_rag = MagicMock()
     mock_rag.query.return_value = ("Test answer", ["source1", "source2"])
     mock_rag.get_course_analytics.return_value = {
         "total_courses": 1,
-        "course_titles": ["Test Course"]
+        "course_titles": ["Test Course"],
     }
     mock_rag.session_manager = MagicMock()
     mock_rag.session_manager.create_session.return_value = "test_session_id"
     mock_rag.session_manager.clear_session.return_value = None
-    
+
     # Store mock in app state
     app.state.rag_system = mock_rag
-    
+
     # API endpoints
     @app.post("/api/query", response_model=QueryResponse)
     async def query_documents(request: QueryRequest):
@@ -247,14 +435,10 @@ def test_app():
             session_id = request.session_id
             if not session_id:
                 session_id = app.state.rag_system.session_manager.create_session()
-            
+
             answer, sources = app.state.rag_system.query(request.query, session_id)
-            
-            return QueryResponse(
-                answer=answer,
-                sources=sources,
-                session_id=session_id
-            )
+
+            return QueryResponse(answer=answer, sources=sources, session_id=session_id)
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
@@ -262,10 +446,10 @@ def test_app():
     async def clear_session(request: ClearSessionRequest):
         try:
             app.state.rag_system.session_manager.clear_session(request.session_id)
-            
+
             return ClearSessionResponse(
                 success=True,
-                message=f"Session {request.session_id} cleared successfully"
+                message=f"Session {request.session_id} cleared successfully",
             )
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
@@ -276,24 +460,45 @@ def test_app():
             analytics = app.state.rag_system.get_course_analytics()
             return CourseStats(
                 total_courses=analytics["total_courses"],
-                course_titles=analytics["course_titles"]
+                course_titles=analytics["course_titles"],
             )
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
-    
+
     return app
 
-@pytest.fixture
-def client(test_app):
-    """Create test client for the app"""
-    return TestClient(test_app)
 
-@pytest.fixture
-def sample_query_request():
-    """Sample query request for testing"""
-    return {"query": "What is machine learning?"}
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """Run async tests on asyncio (anyio ships with FastAPI)"""
+    return "asyncio"
 
-@pytest.fixture
-def sample_clear_session_request():
-    """Sample clear session request for testing"""
-    return {"session_id": "test_session_id"}
+
+@pytest.fixture(scope="session")
+async def client(test_app):
+    """In-process async client speaking ASGI directly to the app
+
+    Skips TestClient's sync-to-async portal thread on every request.
+    """
+    from httpx import ASGITransport, AsyncClient
+
+    async with AsyncClient(
+        transport=ASGITransport(app=test_app), base_url="http://testserver"
+    ) as async_client:
+        yield async_client
+
+
+@pytest.fixture(scope="session")
+def sample_query_body():
+    """Sample query request pre-serialized to JSON bytes
+
+    Serialized once per session so tests skip the per-call dict->JSON
+    round-trip; the server-side Pydantic validation still runs.
+    """
+    return json.dumps({"query": "What is machine learning?"}).encode()
+
+
+@pytest.fixture(scope="session")
+def sample_clear_session_body():
+    """Sample clear session request pre-serialized to JSON bytes"""
+    return json.dumps({"session_id": "test_session_id"}).encode()
@@ -0,0 +1,143 @@
+"""In-process fakes shared by the test suite."""
+
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+
+
+class FakeCompletions:
+    """Deque-backed stand-in for the SDK's chat.completions endpoint
+
+    Tests queue canned responses (or exceptions to raise) instead of
+    patching ``create`` per test.
+    """
+
+    def __init__(self):
+        self._responses = deque()
+        self.calls = []
+
+    def queue(self, *responses):
+        """Queue responses for subsequent create() calls"""
+        self._responses.extend(responses)
+
+    @property
+    def call_count(self):
+        return len(self.calls)
+
+    @property
+    def last_kwargs(self):
+        return self.calls[-1]
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        response = self._responses.popleft()
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class FakeEmbeddingFunction:
+    """Deterministic bag-of-words embedding for tests
+
+    Hashes tokens with crc32 (stable across processes, so safe under
+    xdist) into a small fixed-dimension count vector; texts that share
+    words score as similar. Replaces the sentence-transformer model so
+    the suite never downloads weights or runs inference.
+    """
+
+    DIM = 64
+
+    # Minimal configuration surface Chroma expects from an embedding
+    # function when persisting collection metadata
+    @staticmethod
+    def name():
+        return "fake_hash_embedding"
+
+    @staticmethod
+    def get_config():
+        return {}
+
+    @staticmethod
+    def build_from_config(config):
+        return FakeEmbeddingFunction()
+
+    def __call__(self, input):
+        return [self._embed(text) for text in input]
+
+    @classmethod
+    def _embed(cls, text):
+        vector = [0.0] * cls.DIM
+        for token in text.lower().split():
+            vector[zlib.crc32(token.encode()) % cls.DIM] += 1.0
+        return vector
+
+
+@dataclass
+class FakeChromaCollection:
+    """Pure-Python stand-in for a Chroma collection
+
+    Implements the minimal add/get/query surface VectorStore uses and
+    returns the Chroma dict shapes. "Relevance" is case-insensitive
+    substring containment instead of embedding similarity, which the
+    sample corpus is written to satisfy; the real embedding path keeps
+    one slow-marked integration test.
+    """
+
+    name: str = ""
+    ids: list = field(default_factory=list)
+    documents: list = field(default_factory=list)
+    metadatas: list = field(default_factory=list)
+
+    def add(self, ids, documents, metadatas):
+        self.ids.extend(ids)
+        self.documents.extend(documents)
+        self.metadatas.extend(metadatas)
+
+    def get(self, ids=None):
+        if ids is None:
+            keep = range(len(self.ids))
+        else:
+            wanted = set(ids)
+            keep = [i for i, id_ in enumerate(self.ids) if id_ in wanted]
+        return {
+            "ids": [self.ids[i] for i in keep],
+            "documents": [self.documents[i] for i in keep],
+            "metadatas": [self.metadatas[i] for i in keep],
+        }
+
+    def query(self, query_texts, n_results, where=None):
+        needle = query_texts[0].lower()
+        docs, metas, distances = [], [], []
+        for doc, meta in zip(self.documents, self.metadatas):
+            if len(docs) == n_results:
+                break
+            if needle in doc.lower() and self._matches(meta, where):
+                docs.append(doc)
+                metas.append(meta)
+                distances.append(0.0)
+        return {"documents": [docs], "metadatas": [metas], "distances": [distances]}
+
+    @staticmethod
+    def _matches(meta, where):
+        if where is None:
+            return True
+        if "$and" in where:
+            return all(
+                FakeChromaCollection._matches(meta, clause) for clause in where["$and"]
+            )
+        return all(meta.get(key) == value for key, value in where.items())
+
+
+class FakeChromaClient:
+    """Client surface for VectorStore backed by FakeChromaCollection"""
+
+    def __init__(self):
+        self._collections = {}
+
+    def get_or_create_collection(self, name, embedding_function=None):
+        if name not in self._collections:
+            self._collections[name] = FakeChromaCollection(name=name)
+        return self._collections[name]
+
+    def delete_collection(self, name):
+        del self._collections[name]
@@ -1,658 +1,566 @@
-from unittest.mock import Mock, patch
-
-import pytest
-from ai_generator import AIGenerator
-
-
-class TestAIGenerator:
-    """Test suite for AI Generator tool calling functionality"""
-
-    def test_init(self):
-        """Test AI Generator initialization"""
-        generator = AIGenerator("test_api_key", "glm-4.5")
-
-        assert generator.client is not None
-        assert generator.model == "glm-4.5"
-        assert generator.base_params["model"] == "glm-4.5"
-        assert generator.base_params["temperature"] == 0
-        assert generator.base_params["max_tokens"] == 800
-        assert len(generator.SYSTEM_PROMPT) > 0
-
-        # Check that system prompt supports multiple tool calls
-        assert "Multiple tool use allowed" in generator.SYSTEM_PROMPT
-        assert "up to 2 tool calls sequentially" in generator.SYSTEM_PROMPT
-
-    def test_system_prompt_content(self):
-        """Test that system prompt contains required elements"""
-        generator = AIGenerator("test_api_key", "glm-4.5")
-
-        # Check that system prompt mentions search tools
-        assert "search_course_content" in generator.SYSTEM_PROMPT
-        assert "get_course_outline" in generator.SYSTEM_PROMPT
-
-        # Check that system prompt contains updated tool usage guidelines
-        assert "Tool Usage Guidelines" in generator.SYSTEM_PROMPT
-        assert "Multiple tool use allowed" in generator.SYSTEM_PROMPT
-        assert "up to 2 tool calls sequentially" in generator.SYSTEM_PROMPT
-
-        # Check that system prompt contains examples of sequential usage
-        assert "Examples of Sequential Tool Usage" in generator.SYSTEM_PROMPT
-        assert "When to Use Multiple Tools" in generator.SYSTEM_PROMPT
-        assert "When to Stop After One Tool" in generator.SYSTEM_PROMPT
-
-        # Check that system prompt contains response protocol
-        assert "Response Protocol" in generator.SYSTEM_PROMPT
-        assert "General knowledge questions" in generator.SYSTEM_PROMPT
-        assert "Course content questions" in generator.SYSTEM_PROMPT
-        assert "Complex multi-part questions" in generator.SYSTEM_PROMPT
-
-    def test_generate_response_without_tools(self, mock_ai_generator):
-        """Test direct response generation without tools"""
-        # Mock the API response
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].finish_reason = "stop"
-        mock_response.choices[0].message.content = (
-            "Direct response to general knowledge question"
-        )
-
-        with patch.object(
-            mock_ai_generator.client.chat.completions,
-            "create",
-            return_value=mock_response,
-        ):
-            result = mock_ai_generator.generate_response("What is AI?")
-
-            assert result == "Direct response to general knowledge question"
-            assert isinstance(result, str)
-
-    def test_generate_response_with_max_rounds_parameter(self, mock_ai_generator):
-        """Test that max_rounds parameter is properly handled"""
-        # Mock the API response
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].finish_reason = "stop"
-        mock_response.choices[0].message.content = "Response with custom max_rounds"
-
-        with patch.object(
-            mock_ai_generator.client.chat.completions,
-            "create",
-            return_value=mock_response,
-        ):
-            # Test with custom max_rounds
-            result = mock_ai_generator.generate_response("What is AI?", max_rounds=1)
-
-            assert result == "Response with custom max_rounds"
-            assert isinstance(result, str)
-
-            # Test with default max_rounds
-            result = mock_ai_generator.generate_response("What is AI?")
-
-            assert result == "Response with custom max_rounds"
-            assert isinstance(result, str)
-
-    def test_generate_response_with_tools(self, mock_ai_generator, mock_tool_manager):
-        """Test response generation with tools available"""
-        # Get tool definitions
-        tools = mock_tool_manager.get_tool_definitions()
-
-        # Mock the API response for tool call
-        mock_tool_call = Mock()
-        mock_tool_call.id = "test_tool_call_id"
-        mock_tool_call.function.name = "search_course_content"
-        mock_tool_call.function.arguments = (
-            "{'query': 'test query', 'course_name': 'Test Course'}"
-        )
-
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].finish_reason = "tool_calls"
-        mock_response.choices[0].message.content = "I'll search for that information."
-        mock_response.choices[0].message.tool_calls = [mock_tool_call]
-
-        # Mock final response after tool execution
-        mock_final_response = Mock()
-        mock_final_response.choices = [Mock()]
-        mock_final_response.choices[0].finish_reason = "stop"
-        mock_final_response.choices[0].message.content = (
-            "Found the course content you requested."
-        )
-
-        with patch.object(
-            mock_ai_generator.client.chat.completions,
-            "create",
-            side_effect=[mock_response, mock_final_response],
-        ):
-            result = mock_ai_generator.generate_response(
-                "What does the test course cover?",
-                tools=tools,
-                tool_manager=mock_tool_manager,
-            )
-
-            assert result == "Found the course content you requested."
-            assert isinstance(result, str)
-
-    def test_generate_response_with_conversation_history(self, mock_ai_generator):
-        """Test response generation with conversation history"""
-        history = "User: What is AI?\nAssistant: AI is artificial intelligence."
-
-        # Mock the API response
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].finish_reason = "stop"
-        mock_response.choices[0].message.content = "AI is a fascinating field of study."
-
-        with patch.object(
-            mock_ai_generator.client.chat.completions,
-            "create",
-            return_value=mock_response,
-        ):
-            result = mock_ai_generator.generate_response(
-                "Tell me more about AI", conversation_history=history
-            )
-
-            assert result == "AI is a fascinating field of study."
-            assert isinstance(result, str)
-
-    def test_handle_tool_execution(self, mock_ai_generator, mock_tool_manager):
-        """Test tool execution handling"""
-        # Mock tool call
-        mock_tool_call = Mock()
-        mock_tool_call.id = "test_tool_call_id"
-        mock_tool_call.function.name = "search_course_content"
-        mock_tool_call.function.arguments = "{'query': 'test query'}"
-
-        # Mock initial response with tool calls
-        initial_response = Mock()
-        initial_response.choices = [Mock()]
-        initial_response.choices[0].finish_reason = "tool_calls"
-        initial_response.choices[0].message.content = "I'll search for that."
-        initial_response.choices[0].message.tool_calls = [mock_tool_call]
-
-        # Mock final response
-        final_response = Mock()
-        final_response.choices = [Mock()]
-        final_response.choices[0].finish_reason = "stop"
-        final_response.choices[0].message.content = "Search results: Found content"
-
-        # Mock tool manager execution
-        mock_tool_manager.execute_tool = Mock(return_value="Found course content")
-
-        with patch.object(
-            mock_ai_generator.client.chat.completions,
-            "create",
-            return_value=final_response,
-        ):
-            result = mock_ai_generator._handle_tool_execution(
-                initial_response,
-                {"messages": [{"role": "system", "content": "test"}]},
-                mock_tool_manager,
-            )
-
-            assert result == "Search results: Found content"
-            mock_tool_manager.execute_tool.assert_called_once_with(
-                "search_course_content", query="test query"
-            )
-
-    def test_handle_tool_execution_multiple_tools(
-        self, mock_ai_generator, mock_tool_manager
-    ):
-        """Test handling multiple tool calls"""
-        # Mock multiple tool calls
-        mock_tool_call1 = Mock()
-        mock_tool_call1.id = "tool_call_1"
-        mock_tool_call1.function.name = "search_course_content"
-        mock_tool_call1.function.arguments = "{'query': 'test query 1'}"
-
-        mock_tool_call2 = Mock()
-        mock_tool_call2.id = "tool_call_2"
-        mock_tool_call2.function.name = "get_course_outline"
-        mock_tool_call2.function.arguments = "{'course_title': 'Test Course'}"
-
-        # Mock initial response
-        initial_response = Mock()
-        initial_response.choices = [Mock()]
-        initial_response.choices[0].finish_reason = "tool_calls"
-        initial_response.choices[0].message.content = "I'll search and get the outline."
-        initial_response.choices[0].message.tool_calls = [
-            mock_tool_call1,
-            mock_tool_call2,
-        ]
-
-        # Mock final response
-        final_response = Mock()
-        final_response.choices = [Mock()]
-        final_response.choices[0].finish_reason = "stop"
-        final_response.choices[0].message.content = "Combined results"
-
-        # Mock tool manager execution
-        mock_tool_manager.execute_tool = Mock(side_effect=["Result 1", "Result 2"])
-
-        with patch.object(
-            mock_ai_generator.client.chat.completions,
-            "create",
-            return_value=final_response,
-        ):
-            result = mock_ai_generator._handle_tool_execution(
-                initial_response,
-                {"messages": [{"role": "system", "content": "test"}]},
-                mock_tool_manager,
-            )
-
-            assert result == "Combined results"
-            assert mock_tool_manager.execute_tool.call_count == 2
-
-    def test_tool_execution_error_handling(self, mock_ai_generator, mock_tool_manager):
-        """Test error handling when tool execution fails"""
-        # Mock tool call
-        mock_tool_call = Mock()
-        mock_tool_call.id = "test_tool_call_id"
-        mock_tool_call.function.name = "search_course_content"
-        mock_tool_call.function.arguments = "{'query': 'test query'}"
-
-        # Mock initial response
-        initial_response = Mock()
-        initial_response.choices = [Mock()]
-        initial_response.choices[0].finish_reason = "tool_calls"
-        initial_response.choices[0].message.content = "I'll search for that."
-        initial_response.choices[0].message.tool_calls = [mock_tool_call]
-
-        # Mock final response
-        final_response = Mock()
-        final_response.choices = [Mock()]
-        final_response.choices[0].finish_reason = "stop"
-        final_response.choices[0].message.content = "Error occurred"
-
-        # Mock tool manager to return error
-        mock_tool_manager.execute_tool = Mock(return_value="Error: Tool not found")
-
-        with patch.object(
-            mock_ai_generator.client.chat.completions,
-            "create",
-            return_value=final_response,
-        ):
-            result = mock_ai_generator._handle_tool_execution(
-                initial_response,
-                {"messages": [{"role": "system", "content": "test"}]},
-                mock_tool_manager,
-            )
-
-            assert result == "Error occurred"
-
-    def test_api_error_handling(self, mock_ai_generator):
-        """Test handling of API errors"""
-        # Mock API to raise exception
-        with patch.object(
-            mock_ai_generator.client.chat.completions,
-            "create",
-            side_effect=Exception("API Error"),
-        ):
-            with pytest.raises(Exception) as exc_info:
-                mock_ai_generator.generate_response("test query")
-
-            assert "API Error" in str(exc_info.value)
-
-    def test_conversation_history_formatting(self, mock_ai_generator):
-        """Test that conversation history is properly formatted"""
-        history = "User: What is AI?\nAssistant: AI is artificial intelligence."
-
-        # Mock the API response
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].finish_reason = "stop"
-        mock_response.choices[0].message.content = "Response"
-
-        with patch.object(
-            mock_ai_generator.client.chat.completions, "create"
-        ) as mock_create:
-            mock_create.return_value = mock_response
-
-            mock_ai_generator.generate_response(
-                "Tell me more", conversation_history=history
-            )
-
-            # Check that the API was called with formatted history
-            call_args = mock_create.call_args
-            messages = call_args[1]["messages"]
-
-            # System message should contain history
-            system_content = messages[0]["content"]
-            assert "Previous conversation:" in system_content
-            assert history in system_content
-
-    def test_no_conversation_history(self, mock_ai_generator):
-        """Test behavior when no conversation history is provided"""
-        # Mock the API response
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].finish_reason = "stop"
-        mock_response.choices[0].message.content = "Response"
-
-        with patch.object(
-            mock_ai_generator.client.chat.completions, "create"
-        ) as mock_create:
-            mock_create.return_value = mock_response
-
-            mock_ai_generator.generate_response("test query")
-
-            # Check that the API was called without history
-            call_args = mock_create.call_args
-            messages = call_args[1]["messages"]
-
-            # System message should not contain history
-            system_content = messages[0]["content"]
-            assert "Previous conversation:" not in system_content
-
-    def test_tool_parameter_parsing(self, mock_ai_generator, mock_tool_manager):
-        """Test that tool arguments are properly parsed"""
-        # Mock tool call with complex arguments
-        mock_tool_call = Mock()
-        mock_tool_call.id = "test_tool_call_id"
-        mock_tool_call.function.name = "search_course_content"
-        mock_tool_call.function.arguments = "{'query': 'complex query with spaces', 'course_name': 'Test Course', 'lesson_number': 1}"
-
-        # Mock initial response
-        initial_response = Mock()
-        initial_response.choices = [Mock()]
-        initial_response.choices[0].finish_reason = "tool_calls"
-        initial_response.choices[0].message.content = "I'll search for that."
-        initial_response.choices[0].message.tool_calls = [mock_tool_call]
-
-        # Mock final response
-        final_response = Mock()
-        final_response.choices = [Mock()]
-        final_response.choices[0].finish_reason = "stop"
-        final_response.choices[0].message.content = "Search results"
-
-        # Mock tool manager execution for this test
-        mock_tool_manager.execute_tool = Mock(return_value="Tool executed successfully")
-
-        with patch.object(
-            mock_ai_generator.client.chat.completions,
-            "create",
-            return_value=final_response,
-        ):
-            mock_ai_generator._handle_tool_execution(
-                initial_response,
-                {"messages": [{"role": "system", "content": "test"}]},
-                mock_tool_manager,
-            )
-
-            # Check that tool was called with correct arguments
-            mock_tool_manager.execute_tool.assert_called_once_with(
-                "search_course_content",
-                query="complex query with spaces",
-                course_name="Test Course",
-                lesson_number=1,
-            )
-
-    def test_sequential_tool_calls(self, mock_ai_generator, mock_tool_manager):
-        """Test two rounds of sequential tool calls"""
-        # First round: get course outline
-        mock_tool_call_1 = Mock()
-        mock_tool_call_1.id = "tool_call_1"
-        mock_tool_call_1.function.name = "get_course_outline"
-        mock_tool_call_1.function.arguments = "{'course_title': 'Course X'}"
-
-        mock_response_1 = Mock()
-        mock_response_1.choices = [Mock()]
-        mock_response_1.choices[0].finish_reason = "tool_calls"
-        mock_response_1.choices[0].message.content = "Let me get the course outline."
-        mock_response_1.choices[0].message.tool_calls = [mock_tool_call_1]
-
-        # Second round: search for related content
-        mock_tool_call_2 = Mock()
-        mock_tool_call_2.id = "tool_call_2"
-        mock_tool_call_2.function.name = "search_course_content"
-        mock_tool_call_2.function.arguments = "{'query': 'lesson 3 topic'}"
-
-        mock_response_2 = Mock()
-        mock_response_2.choices = [Mock()]
-        mock_response_2.choices[0].finish_reason = "tool_calls"
-        mock_response_2.choices[0].message.content = (
-            "Now let me search for related content."
-        )
-        mock_response_2.choices[0].message.tool_calls = [mock_tool_call_2]
-
-        # Final response
-        mock_final_response = Mock()
-        mock_final_response.choices = [Mock()]
-        mock_final_response.choices[0].finish_reason = "stop"
-        mock_final_response.choices[0].message.content = (
-            "Based on both searches, I found..."
-        )
-
-        # Mock tool execution
-        mock_tool_manager.execute_tool = Mock(
-            side_effect=[
-                "Course outline: Lesson 3 is about Advanced Topics",
-                "Found related courses covering Advanced Topics",
-            ]
-        )
-
-        with patch.object(
-            mock_ai_generator.client.chat.completions,
-            "create",
-            side_effect=[mock_response_1, mock_response_2, mock_final_response],
-        ):
-            result = mock_ai_generator.generate_response(
-                "Find courses similar to lesson 3 of Course X",
-                tools=mock_tool_manager.get_tool_definitions(),
-                tool_manager=mock_tool_manager,
-            )
-
-            assert "Based on both searches" in result
-            assert mock_tool_manager.execute_tool.call_count == 2
-            mock_tool_manager.execute_tool.assert_any_call(
-                "get_course_outline", course_title="Course X"
-            )
-            mock_tool_manager.execute_tool.assert_any_call(
-                "search_course_content", query="lesson 3 topic"
-            )
-
-    def test_max_rounds_limit(self, mock_ai_generator, mock_tool_manager):
-        """Test that max_rounds limit is respected"""
-        # Create a tool call that would continue indefinitely
-        mock_tool_call = Mock()
-        mock_tool_call.id = "tool_call_id"
-        mock_tool_call.function.name = "search_course_content"
-        mock_tool_call.function.arguments = "{'query': 'test'}"
-
-        # Mock tool response (requests another tool call)
-        mock_tool_response = Mock()
-        mock_tool_response.choices = [Mock()]
-        mock_tool_response.choices[0].finish_reason = "tool_calls"
-        mock_tool_response.choices[0].message.content = "I need to search again."
-        mock_tool_response.choices[0].message.tool_calls = [mock_tool_call]
-
-        # Mock final response
-        mock_final_response = Mock()
-        mock_final_response.choices = [Mock()]
-        mock_final_response.choices[0].finish_reason = "stop"
-        mock_final_response.choices[0].message.content = (
-            "Final response after max rounds."
-        )
-
-        # Mock tool execution
-        mock_tool_manager.execute_tool = Mock(return_value="Some result")
-
-        # API calls: 2 tool calls + 1 final response
-        with patch.object(
-            mock_ai_generator.client.chat.completions,
-            "create",
-            side_effect=[mock_tool_response, mock_tool_response, mock_final_response],
-        ):
-            result = mock_ai_generator.generate_response(
-                "Complex query",
-                tools=mock_tool_manager.get_tool_definitions(),
-                tool_manager=mock_tool_manager,
-                max_rounds=2,  # Limit to 2 rounds
-            )
-
-            # Should stop after 2 rounds
-            assert mock_tool_manager.execute_tool.call_count == 2
-            assert result == "Final response after max rounds."
-
-    def test_single_tool_call_backward_compatibility(
-        self, mock_ai_generator, mock_tool_manager
-    ):
-        """Test that single tool calls still work (backward compatibility)"""
-        # Mock tool call
-        mock_tool_call = Mock()
-        mock_tool_call.id = "test_tool_call_id"
-        mock_tool_call.function.name = "search_course_content"
-        mock_tool_call.function.arguments = "{'query': 'test query'}"
-
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].finish_reason = "tool_calls"
-        mock_response.choices[0].message.content = "I'll search for that."
-        mock_response.choices[0].message.tool_calls = [mock_tool_call]
-
-        # Mock final response
-        mock_final_response = Mock()
-        mock_final_response.choices = [Mock()]
-        mock_final_response.choices[0].finish_reason = "stop"
-        mock_final_response.choices[0].message.content = "Found the course content."
-
-        # Mock tool execution
-        mock_tool_manager.execute_tool = Mock(return_value="Found course content")
-
-        with patch.object(
-            mock_ai_generator.client.chat.completions,
-            "create",
-            side_effect=[mock_response, mock_final_response],
-        ):
-            result = mock_ai_generator.generate_response(
-                "What does the test course cover?",
-                tools=mock_tool_manager.get_tool_definitions(),
-                tool_manager=mock_tool_manager,
-            )
-
-            assert result == "Found the course content."
-            assert mock_tool_manager.execute_tool.call_count == 1
-            mock_tool_manager.execute_tool.assert_called_once_with(
-                "search_course_content", query="test query"
-            )
-
-    def test_api_error_handling(self, mock_ai_generator, mock_tool_manager):
-        """Test API error handling in new architecture"""
-        with patch.object(
-            mock_ai_generator.client.chat.completions,
-            "create",
-            side_effect=Exception("API Error"),
-        ):
-            result = mock_ai_generator.generate_response(
-                "Test query",
-                tools=mock_tool_manager.get_tool_definitions(),
-                tool_manager=mock_tool_manager,
-            )
-
-            assert "API调用错误" in result
-
-    def test_tool_execution_error_handling(self, mock_ai_generator, mock_tool_manager):
-        """Test tool execution error handling in new architecture"""
-        # Mock tool call
-        mock_tool_call = Mock()
-        mock_tool_call.id = "test_tool_call_id"
-        mock_tool_call.function.name = "search_course_content"
-        mock_tool_call.function.arguments = "{'query': 'test'}"
-
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].finish_reason = "tool_calls"
-        mock_response.choices[0].message.content = "I'll search for that."
-        mock_response.choices[0].message.tool_calls = [mock_tool_call]
-
-        # Mock tool execution error
-        mock_tool_manager.execute_tool = Mock(return_value="Error: Tool not found")
-
-        mock_final_response = Mock()
-        mock_final_response.choices = [Mock()]
-        mock_final_response.choices[0].finish_reason = "stop"
-        mock_final_response.choices[0].message.content = "Response after tool error."
-
-        with patch.object(
-            mock_ai_generator.client.chat.completions,
-            "create",
-            side_effect=[mock_response, mock_final_response],
-        ):
-            result = mock_ai_generator.generate_response(
-                "Test query",
-                tools=mock_tool_manager.get_tool_definitions(),
-                tool_manager=mock_tool_manager,
-            )
-
-            assert "Response after tool error" in result
-            mock_tool_manager.execute_tool.assert_called_once()
-
-    def test_build_initial_messages(self, mock_ai_generator):
-        """Test _build_initial_messages method"""
-        # Test without conversation history
-        messages = mock_ai_generator._build_initial_messages("What is AI?")
-        assert len(messages) == 2
-        assert messages[0]["role"] == "system"
-        assert messages[1]["role"] == "user"
-        assert messages[1]["content"] == "What is AI?"
-        assert "Previous conversation:" not in messages[0]["content"]
-
-        # Test with conversation history
-        history = "User: Hello\nAssistant: Hi there!"
-        messages = mock_ai_generator._build_initial_messages("What is AI?", history)
-        assert len(messages) == 2
-        assert "Previous conversation:" in messages[0]["content"]
-        assert history in messages[0]["content"]
-
-    def test_build_api_params(self, mock_ai_generator):
-        """Test _build_api_params method"""
-        messages = [{"role": "system", "content": "test"}]
-        tools = [{"type": "function", "function": {"name": "test"}}]
-
-        # Test first round with tools
-        params = mock_ai_generator._build_api_params(messages, tools, 0)
-        assert "tools" in params
-        assert "tool_choice" in params
-        assert params["tools"] == tools
-
-        # Test second round (no tools)
-        params = mock_ai_generator._build_api_params(messages, tools, 1)
-        assert "tools" not in params
-        assert "tool_choice" not in params
-
-        # Test without tools
-        params = mock_ai_generator._build_api_params(messages, None, 0)
-        assert "tools" not in params
-        assert "tool_choice" not in params
-
-    def test_should_terminate(self, mock_ai_generator, mock_tool_manager):
-        """Test _should_terminate method"""
-        # Create mock response with tool calls
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].finish_reason = "tool_calls"
-        mock_response.choices[0].message.tool_calls = [Mock()]
-
-        # Test termination conditions
-        assert (
-            mock_ai_generator._should_terminate(mock_response, 3, 2, mock_tool_manager)
-            == True
-        )  # Max rounds exceeded
-        assert (
-            mock_ai_generator._should_terminate(mock_response, 1, 2, None) == True
-        )  # No tool manager
-        assert (
-            mock_ai_generator._should_terminate(mock_response, 1, 2, mock_tool_manager)
-            == False
-        )  # Should continue
-
-        # Test response without tool calls
-        mock_response_no_tools = Mock()
-        mock_response_no_tools.choices = [Mock()]
-        mock_response_no_tools.choices[0].finish_reason = "stop"
-        mock_response_no_tools.choices[0].message.tool_calls = []
-        assert (
-            mock_ai_generator._should_terminate(
-                mock_response_no_tools, 0, 2, mock_tool_manager
-            )
-            == True
-        )
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from ai_generator import AIGenerator
+
+# Canonical tool-call argument payloads, defined once as both the JSON
+# string the code under test parses and the dict asserted against
+# execute_tool calls
+ARGS_SIMPLE_QUERY = '{"query": "test query"}'
+ARGS_SIMPLE_QUERY_PARSED = {"query": "test query"}
+ARGS_TEST_QUERY = '{"query": "test"}'
+ARGS_COURSE_FILTER = '{"query": "test query", "course_name": "Test Course"}'
+
+# Canonical conversation-history examples shared across tests
+_DEFAULT_HISTORY = "User: What is AI?\nAssistant: AI is artificial intelligence."
+_SHORT_HISTORY = "User: Hello\nAssistant: Hi there!"
+
+# Every element the system prompt must mention, checked in a single pass
+REQUIRED_PROMPT_TOKENS = frozenset(
+    [
+        "Multiple tool use allowed",
+        "up to 2 tool calls sequentially",
+        "search_course_content",
+        "get_course_outline",
+        "Tool Usage Guidelines",
+        "Examples of Sequential Tool Usage",
+        "When to Use Multiple Tools",
+        "When to Stop After One Tool",
+        "Response Protocol",
+        "General knowledge questions",
+        "Course content questions",
+        "Complex multi-part questions",
+    ]
+)
+
+
+@pytest.fixture(autouse=True)
+def fake_create(fake_create):
+    """Install the fake completions endpoint for every test in this module
+
+    Overrides the conftest fixture with an autouse version so no test can
+    accidentally hit the real SDK endpoint; the install/restore logic stays
+    in conftest.
+    """
+    return fake_create
+
+
+def _last_system_content(fake_create):
+    """Return the system message content from the most recent create() call"""
+    return fake_create.last_kwargs["messages"][0]["content"]
+
+
+class _RecordingExecutor:
+    """Plain-callable execute_tool stand-in that records its calls
+
+    Results come from a positional queue or a name-keyed mapping; the
+    mapping keeps results deterministic when tool calls run concurrently.
+    """
+
+    def __init__(self, results=(), by_name=None):
+        self._results = iter(results)
+        self._by_name = by_name
+        self.calls = []
+
+    @property
+    def call_count(self):
+        return len(self.calls)
+
+    def __call__(self, name, **kwargs):
+        self.calls.append((name, kwargs))
+        if self._by_name is not None:
+            return self._by_name[name]
+        return next(self._results)
+
+
+def queue_tool_results(tool_manager, *results, by_name=None):
+    """Replace tool_manager.execute_tool with a recording result queue"""
+    executor = _RecordingExecutor(results, by_name=by_name)
+    tool_manager.execute_tool = executor
+    return executor
+
+
+class TestAIGeneratorConstants:
+    """Pure unit tests for AI Generator configuration and helpers"""
+
+    def test_init(self, mock_ai_generator):
+        """Test AI Generator initialization"""
+        generator = mock_ai_generator
+
+        assert generator.client is not None
+        assert generator.model == "glm-4.5"
+        assert generator.base_params["model"] == "glm-4.5"
+        assert generator.base_params["temperature"] == 0
+        assert generator.base_params["max_tokens"] == 800
+        assert len(generator.SYSTEM_PROMPT) > 0
+
+    def test_system_prompt_content(self):
+        """Test that system prompt contains all required elements"""
+        # SYSTEM_PROMPT is a class attribute, so no instance (and no SDK
+        # client) is needed to verify it
+        missing = [
+            token
+            for token in REQUIRED_PROMPT_TOKENS
+            if token not in AIGenerator.SYSTEM_PROMPT
+        ]
+        assert not missing, f"Missing prompt tokens: {missing}"
+
+    def test_build_initial_messages(self, mock_ai_generator):
+        """Test _build_initial_messages method"""
+        # Test without conversation history
+        messages = mock_ai_generator._build_initial_messages("What is AI?")
+        assert len(messages) == 2
+        assert messages[0]["role"] == "system"
+        assert messages[1]["role"] == "user"
+        assert messages[1]["content"] == "What is AI?"
+        assert "Previous conversation:" not in messages[0]["content"]
+
+        # Test with conversation history
+        history = _SHORT_HISTORY
+        messages = mock_ai_generator._build_initial_messages("What is AI?", history)
+        assert len(messages) == 2
+        assert "Previous conversation:" in messages[0]["content"]
+        assert history in messages[0]["content"]
+
+    def test_build_api_params(self, mock_ai_generator):
+        """Test _build_api_params method"""
+        messages = [{"role": "system", "content": "test"}]
+        tools = [{"type": "function", "function": {"name": "test"}}]
+
+        # Test first round with tools
+        params = mock_ai_generator._build_api_params(messages, tools, 0)
+        assert "tools" in params
+        assert "tool_choice" in params
+        assert params["tools"] == tools
+
+        # Test second round (no tools)
+        params = mock_ai_generator._build_api_params(messages, tools, 1)
+        assert "tools" not in params
+        assert "tool_choice" not in params
+
+        # Test without tools
+        params = mock_ai_generator._build_api_params(messages, None, 0)
+        assert "tools" not in params
+        assert "tool_choice" not in params
+
+    def test_should_terminate(
+        self,
+        mock_ai_generator,
+        mock_tool_manager,
+        make_tool_response,
+        make_stop_response,
+    ):
+        """Test _should_terminate method"""
+        # Create mock response with tool calls
+        mock_response = make_tool_response(
+            ("search_course_content", '{"query": "test"}', "tool_call_id")
+        )
+
+        # Test termination conditions
+        assert (
+            mock_ai_generator._should_terminate(mock_response, 3, 2, mock_tool_manager)
+            == True
+        )  # Max rounds exceeded
+        assert (
+            mock_ai_generator._should_terminate(mock_response, 1, 2, None) == True
+        )  # No tool manager
+        assert (
+            mock_ai_generator._should_terminate(mock_response, 1, 2, mock_tool_manager)
+            == False
+        )  # Should continue
+
+        # Test response without tool calls
+        mock_response_no_tools = make_stop_response("Done")
+        assert (
+            mock_ai_generator._should_terminate(
+                mock_response_no_tools, 0, 2, mock_tool_manager
+            )
+            == True
+        )
+
+
+class TestAIGeneratorAPI:
+    """Tests exercising the fake chat.completions endpoint"""
+
+    @pytest.mark.parametrize(
+        "query,kwargs,content,history_expected",
+        [
+            ("What is AI?", {}, "Direct response to general knowledge question", None),
+            ("What is AI?", {"max_rounds": 1}, "Response with custom max_rounds", None),
+            (
+                "Tell me more about AI",
+                {"conversation_history": _DEFAULT_HISTORY},
+                "AI is a fascinating field of study.",
+                True,
+            ),
+            ("test query", {}, "Response", False),
+        ],
+    )
+    def test_generate_response_simple(
+        self,
+        mock_ai_generator,
+        fake_create,
+        make_stop_response,
+        query,
+        kwargs,
+        content,
+        history_expected,
+    ):
+        """Test single-round responses that finish without tool calls"""
+        fake_create.queue(make_stop_response(content))
+
+        result = mock_ai_generator.generate_response(query, **kwargs)
+
+        assert result == content
+
+        # Optionally verify whether history made it into the system message
+        if history_expected is not None:
+            system_content = _last_system_content(fake_create)
+            assert ("Previous conversation:" in system_content) is history_expected
+
+    def test_generate_response_with_tools(
+        self,
+        mock_ai_generator,
+        mock_tool_manager,
+        tool_definitions,
+        fake_create,
+        make_tool_response,
+        make_stop_response,
+    ):
+        """Test response generation with tools available"""
+        # Get tool definitions
+        tools = tool_definitions
+
+        # Mock the API response for tool call
+        mock_response = make_tool_response(
+            ("search_course_content", ARGS_COURSE_FILTER, "test_tool_call_id"),
+            content="I'll search for that information.",
+        )
+
+        # Mock final response after tool execution
+        mock_final_response = make_stop_response(
+            "Found the course content you requested."
+        )
+
+        fake_create.queue(mock_response, mock_final_response)
+
+        result = mock_ai_generator.generate_response(
+            "What does the test course cover?",
+            tools=tools,
+            tool_manager=mock_tool_manager,
+        )
+
+        assert result == "Found the course content you requested."
+
+    def test_append_tool_results_multiple_tools(
+        self, mock_ai_generator, mock_tool_manager, make_tool_response
+    ):
+        """Test handling multiple tool calls in a single round"""
+        # Mock response with multiple tool calls
+        response = make_tool_response(
+            ("search_course_content", '{"query": "test query 1"}', "tool_call_1"),
+            ("get_course_outline", '{"course_title": "Test Course"}', "tool_call_2"),
+            content="I'll search and get the outline.",
+        )
+
+        # Queue tool results keyed by name
+        executor = queue_tool_results(
+            mock_tool_manager,
+            by_name={
+                "search_course_content": "Result 1",
+                "get_course_outline": "Result 2",
+            },
+        )
+
+        messages = [{"role": "system", "content": "test"}]
+        mock_ai_generator._append_tool_results(messages, response, mock_tool_manager)
+
+        # Assistant message plus one tool result per call
+        assert len(messages) == 4
+        assert messages[1]["role"] == "assistant"
+        assert messages[2] == {
+            "tool_call_id": "tool_call_1",
+            "role": "tool",
+            "content": "Result 1",
+        }
+        assert messages[3] == {
+            "tool_call_id": "tool_call_2",
+            "role": "tool",
+            "content": "Result 2",
+        }
+        assert executor.call_count == 2
+
+    def test_conversation_history_formatting(
+        self, mock_ai_generator, fake_create, make_stop_response
+    ):
+        """Test that conversation history is properly formatted"""
+        history = _DEFAULT_HISTORY
+
+        fake_create.queue(make_stop_response("Response"))
+
+        mock_ai_generator.generate_response(
+            "Tell me more", conversation_history=history
+        )
+
+        # System message should contain the formatted history
+        system_content = _last_system_content(fake_create)
+        assert "Previous conversation:" in system_content
+        assert history in system_content
+
+    def test_tool_parameter_parsing(self, mock_ai_generator, mock_tool_manager):
+        """Test that tool arguments are properly parsed"""
+        # Fake tool call with complex arguments
+        mock_tool_call = SimpleNamespace(
+            id="test_tool_call_id",
+            function=SimpleNamespace(
+                name="search_course_content",
+                arguments='{"query": "complex query with spaces", "course_name": "Test Course", "lesson_number": 1}',
+            ),
+        )
+
+        # Mock tool manager execution for this test
+        mock_tool_manager.execute_tool = Mock(return_value="Tool executed successfully")
+
+        result = mock_ai_generator._execute_single_tool(
+            mock_tool_call, mock_tool_manager
+        )
+
+        assert result == "Tool executed successfully"
+        # Check that tool was called with correct arguments
+        mock_tool_manager.execute_tool.assert_called_once_with(
+            "search_course_content",
+            query="complex query with spaces",
+            course_name="Test Course",
+            lesson_number=1,
+        )
+
+    @pytest.mark.parametrize(
+        "n_tool_rounds,max_rounds,expected_calls",
+        [
+            (1, 2, 1),  # single tool call (backward compatibility)
+            (2, 2, 2),  # two sequential tool rounds
+            (3, 2, 2),  # stops at the max_rounds limit
+        ],
+    )
+    def test_tool_call_rounds(
+        self,
+        mock_ai_generator,
+        mock_tool_manager,
+        tool_definitions,
+        fake_create,
+        make_tool_response,
+        make_stop_response,
+        n_tool_rounds,
+        max_rounds,
+        expected_calls,
+    ):
+        """Test tool-calling behavior across round counts and the limit"""
+        tool_response = make_tool_response(
+            ("search_course_content", ARGS_SIMPLE_QUERY, "tool_call_id"),
+            content="I need to search.",
+        )
+        final_response = make_stop_response("Final response.")
+
+        # Queue one tool result per executed round
+        executor = queue_tool_results(
+            mock_tool_manager, *["Some result"] * expected_calls
+        )
+
+        # One tool response per executed round, then the final synthesis;
+        # rounds past the max_rounds cutoff are never requested
+        fake_create.queue(
+            *[tool_response] * min(n_tool_rounds, max_rounds), final_response
+        )
+
+        result = mock_ai_generator.generate_response(
+            "What does the test course cover?",
+            tools=tool_definitions,
+            tool_manager=mock_tool_manager,
+            max_rounds=max_rounds,
+        )
+
+        assert result == "Final response."
+        assert fake_create.call_count == expected_calls + 1
+        assert executor.call_count == expected_calls
+        assert executor.calls[-1] == ("search_course_content", ARGS_SIMPLE_QUERY_PARSED)
+
+    def test_api_error_handling(
+        self, mock_ai_generator, mock_tool_manager, tool_definitions, fake_create
+    ):
+        """Test API error handling in new architecture"""
+        fake_create.queue(Exception("API Error"))
+
+        result = mock_ai_generator.generate_response(
+            "Test query",
+            tools=tool_definitions,
+            tool_manager=mock_tool_manager,
+        )
+
+        assert "API调用错误" in result
+
+    def test_tool_execution_error_handling(
+        self,
+        mock_ai_generator,
+        mock_tool_manager,
+        tool_definitions,
+        fake_create,
+        make_tool_response,
+        make_stop_response,
+    ):
+        """Test tool execution error handling in new architecture"""
+        mock_response = make_tool_response(
+            ("search_course_content", ARGS_TEST_QUERY, "test_tool_call_id"),
+            content="I'll search for that.",
+        )
+
+        # Mock tool execution error
+        mock_tool_manager.execute_tool = Mock(return_value="Error: Tool not found")
+
+        mock_final_response = make_stop_response("Response after tool error.")
+
+        fake_create.queue(mock_response, mock_final_response)
+
+        result = mock_ai_generator.generate_response(
+            "Test query",
+            tools=tool_definitions,
+            tool_manager=mock_tool_manager,
+        )
+
+        assert "Response after tool error" in result
+        mock_tool_manager.execute_tool.assert_called_once()
+
+
+class TestAIGeneratorStreaming:
+    """Tests for the streaming entry point against the fake endpoint"""
+
+    def test_stream_direct_answer(
+        self, mock_ai_generator, fake_create, make_stream_response
+    ):
+        """Test streaming a direct answer with no tools offered"""
+        fake_create.queue(
+            make_stream_response("AI is ", "artificial ", "intelligence.")
+        )
+
+        fragments = list(mock_ai_generator.generate_response_stream("What is AI?"))
+
+        assert "".join(fragments) == "AI is artificial intelligence."
+        # A single streaming call, no tool round
+        assert fake_create.call_count == 1
+        assert fake_create.last_kwargs["stream"] is True
+        assert "tools" not in fake_create.last_kwargs
+
+    def test_stream_answer_without_tool_use(
+        self,
+        mock_ai_generator,
+        mock_tool_manager,
+        tool_definitions,
+        fake_create,
+        make_stop_response,
+    ):
+        """Test streaming when the model answers in the tool round"""
+        fake_create.queue(make_stop_response("Direct answer, no tools needed."))
+
+        fragments = list(
+            mock_ai_generator.generate_response_stream(
+                "What is AI?",
+                tools=tool_definitions,
+                tool_manager=mock_tool_manager,
+            )
+        )
+
+        # The blocking round answered outright, so its content is yielded
+        # whole and no streaming call follows
+        assert fragments == ["Direct answer, no tools needed."]
+        assert fake_create.call_count == 1
+
+    def test_stream_after_tool_round(
+        self,
+        mock_ai_generator,
+        mock_tool_manager,
+        tool_definitions,
+        fake_create,
+        make_tool_response,
+        make_stream_response,
+    ):
+        """Test a blocking tool round followed by streamed synthesis"""
+        fake_create.queue(
+            make_tool_response(
+                ("search_course_content", ARGS_SIMPLE_QUERY, "tool_call_id"),
+                content="I need to search.",
+            ),
+            make_stream_response("Found ", "the course ", "content."),
+        )
+        executor = queue_tool_results(mock_tool_manager, "Some result")
+
+        fragments = list(
+            mock_ai_generator.generate_response_stream(
+                "What does the test course cover?",
+                tools=tool_definitions,
+                tool_manager=mock_tool_manager,
+            )
+        )
+
+        assert "".join(fragments) == "Found the course content."
+        assert executor.call_count == 1
+        # Tool round uses the blocking endpoint; only the synthesis streams
+        assert fake_create.call_count == 2
+        assert "stream" not in fake_create.calls[0]
+        assert fake_create.last_kwargs["stream"] is True
+
+    def test_stream_api_error_mid_stream(
+        self, mock_ai_generator, fake_create, make_stream_response
+    ):
+        """Test that an error mid-stream surfaces after partial content"""
+        fake_create.queue(
+            make_stream_response("Partial ", error=Exception("Connection dropped"))
+        )
+
+        fragments = list(mock_ai_generator.generate_response_stream("What is AI?"))
+
+        assert fragments[0] == "Partial "
+        assert "API调用错误" in fragments[-1]
+        assert "Connection dropped" in fragments[-1]
+
+
+class TestAIGeneratorAsync:
+    """Tests for the async entry point against the fake endpoint"""
+
+    pytestmark = pytest.mark.anyio
+
+    async def test_generate_response_async(
+        self, mock_ai_generator, fake_create, make_stop_response
+    ):
+        """Test that the async entry point returns the generated response"""
+        fake_create.queue(make_stop_response("Async response"))
+
+        result = await mock_ai_generator.generate_response_async("What is AI?")
+
+        assert result == "Async response"
+        assert fake_create.call_count == 1
+
+    async def test_generate_response_async_concurrent(
+        self, mock_ai_generator, fake_create, make_stop_response
+    ):
+        """Test that concurrent async calls each complete"""
+        response = make_stop_response("Concurrent response")
+        fake_create.queue(response, response, response)
+
+        results = await asyncio.gather(
+            mock_ai_generator.generate_response_async("Query one"),
+            mock_ai_generator.generate_response_async("Query two"),
+            mock_ai_generator.generate_response_async("Query three"),
+        )
+
+        assert results == ["Concurrent response"] * 3
+
+    async def test_generate_response_async_api_error(
+        self, mock_ai_generator, fake_create
+    ):
+        """Test that API errors surface through the async path"""
+        fake_create.queue(Exception("API Error"))
+
+        result = await mock_ai_generator.generate_response_async("Test query")
+
+        assert "API调用错误" in result
@@ -1,172 +1,203 @@
-import pytest
-from fastapi.testclient import TestClient
-from unittest.mock import MagicMock, patch
-
-
-class TestAPIEndpoints:
-    """Test suite for FastAPI endpoints"""
-
-    def test_query_endpoint_success(self, client, sample_query_request):
-        """Test successful query endpoint"""
-        response = client.post("/api/query", json=sample_query_request)
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert "answer" in data
-        assert "sources" in data
-        assert "session_id" in data
-        assert data["answer"] == "Test answer"
-        assert data["sources"] == ["source1", "source2"]
-        assert data["session_id"] == "test_session_id"
-
-    def test_query_endpoint_with_session_id(self, client):
-        """Test query endpoint with existing session ID"""
-        request_data = {"query": "What is AI?", "session_id": "existing_session"}
-        response = client.post("/api/query", json=request_data)
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert data["session_id"] == "existing_session"
-
-    def test_query_endpoint_empty_query(self, client):
-        """Test query endpoint with empty query"""
-        request_data = {"query": ""}
-        response = client.post("/api/query", json=request_data)
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert "answer" in data
-
-    def test_query_endpoint_exception_handling(self, client):
-        """Test query endpoint exception handling"""
-        with patch.object(client.app.state.rag_system, 'query', side_effect=Exception("Test error")):
-            request_data = {"query": "test query"}
-            response = client.post("/api/query", json=request_data)
-            
-            assert response.status_code == 500
-            data = response.json()
-            assert "detail" in data
-            assert data["detail"] == "Test error"
-
-    def test_clear_session_endpoint_success(self, client, sample_clear_session_request):
-        """Test successful clear session endpoint"""
-        response = client.post("/api/clear-session", json=sample_clear_session_request)
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert data["success"] is True
-        assert data["message"] == "Session test_session_id cleared successfully"
-
-    def test_clear_session_endpoint_exception_handling(self, client):
-        """Test clear session endpoint exception handling"""
-        with patch.object(client.app.state.rag_system.session_manager, 'clear_session', side_effect=Exception("Clear error")):
-            request_data = {"session_id": "test_session"}
-            response = client.post("/api/clear-session", json=request_data)
-            
-            assert response.status_code == 500
-            data = response.json()
-            assert "detail" in data
-            assert data["detail"] == "Clear error"
-
-    def test_get_course_stats_endpoint_success(self, client):
-        """Test successful get course stats endpoint"""
-        response = client.get("/api/courses")
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert data["total_courses"] == 1
-        assert data["course_titles"] == ["Test Course"]
-
-    def test_get_course_stats_endpoint_exception_handling(self, client):
-        """Test get course stats endpoint exception handling"""
-        with patch.object(client.app.state.rag_system, 'get_course_analytics', side_effect=Exception("Stats error")):
-            response = client.get("/api/courses")
-            
-            assert response.status_code == 500
-            data = response.json()
-            assert "detail" in data
-            assert data["detail"] == "Stats error"
-
-    def test_root_endpoint_redirect(self, client):
-        """Test root endpoint redirects appropriately"""
-        response = client.get("/")
-        assert response.status_code == 404
-
-    def test_invalid_endpoint(self, client):
-        """Test invalid endpoint returns 404"""
-        response = client.get("/invalid/endpoint")
-        assert response.status_code == 404
-
-    def test_query_endpoint_invalid_method(self, client):
-        """Test query endpoint with invalid HTTP method"""
-        response = client.get("/api/query")
-        assert response.status_code == 405
-
-    def test_clear_session_endpoint_invalid_method(self, client):
-        """Test clear session endpoint with invalid HTTP method"""
-        response = client.get("/api/clear-session")
-        assert response.status_code == 405
-
-    def test_cors_headers(self, client):
-        """Test CORS headers are present"""
-        response = client.options("/api/query")
-        assert response.status_code == 405
-        # CORS headers may not be present on OPTIONS requests in test client
-
-    def test_query_endpoint_request_validation(self, client):
-        """Test query endpoint request validation"""
-        # Missing required query field
-        response = client.post("/api/query", json={})
-        assert response.status_code == 422
-
-    def test_clear_session_endpoint_request_validation(self, client):
-        """Test clear session endpoint request validation"""
-        # Missing required session_id field
-        response = client.post("/api/clear-session", json={})
-        assert response.status_code == 422
-
-    @pytest.mark.integration
-    def test_full_query_flow(self, client):
-        """Test complete flow from query to session management"""
-        # Initial query
-        query_data = {"query": "What is machine learning?"}
-        response = client.post("/api/query", json=query_data)
-        
-        assert response.status_code == 200
-        data = response.json()
-        session_id = data["session_id"]
-        
-        # Clear the session
-        clear_data = {"session_id": session_id}
-        response = client.post("/api/clear-session", json=clear_data)
-        
-        assert response.status_code == 200
-        assert response.json()["success"] is True
-
-    @pytest.mark.api
-    def test_api_response_structure(self, client):
-        """Test API response structures match expected format"""
-        # Test query response
-        query_data = {"query": "test query"}
-        response = client.post("/api/query", json=query_data)
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert isinstance(data["answer"], str)
-        assert isinstance(data["sources"], list)
-        assert isinstance(data["session_id"], str)
-        
-        # Test courses response
-        response = client.get("/api/courses")
-        assert response.status_code == 200
-        data = response.json()
-        assert isinstance(data["total_courses"], int)
-        assert isinstance(data["course_titles"], list)
-        
-        # Test clear session response
-        clear_data = {"session_id": "test"}
-        response = client.post("/api/clear-session", json=clear_data)
-        assert response.status_code == 200
-        data = response.json()
-        assert isinstance(data["success"], bool)
-        assert isinstance(data["message"], str)
\ No newline at end of file
+from operator import attrgetter
+
+import pytest
+
+# The whole module talks to the app through the async ASGI client
+pytestmark = pytest.mark.anyio
+
+# Request payloads shared across tests, built once at import; treated as
+# read-only (httpx only serializes them)
+QUERY_WITH_SESSION = {"query": "What is AI?", "session_id": "existing_session"}
+EMPTY_QUERY = {"query": ""}
+FULL_FLOW_QUERY = {"query": "What is machine learning?"}
+
+
+@pytest.fixture(autouse=True)
+def _reset_rag_mock(test_app):
+    """Clear recorded calls on the shared app's RAG mock between tests"""
+    yield
+    test_app.state.rag_system.reset_mock()
+
+
+class TestAPIEndpoints:
+    """Test suite for FastAPI endpoints"""
+
+    async def test_query_endpoint_success(self, client, sample_query_body):
+        """Test successful query endpoint"""
+        response = await client.post(
+            "/api/query",
+            content=sample_query_body,
+            headers={"content-type": "application/json"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert "answer" in data
+        assert "sources" in data
+        assert "session_id" in data
+        assert data["answer"] == "Test answer"
+        assert data["sources"] == ["source1", "source2"]
+        assert data["session_id"] == "test_session_id"
+
+    async def test_query_endpoint_with_session_id(self, client):
+        """Test query endpoint with existing session ID"""
+        response = await client.post("/api/query", json=QUERY_WITH_SESSION)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["session_id"] == "existing_session"
+
+    async def test_query_endpoint_empty_query(self, client):
+        """Test query endpoint with empty query"""
+        response = await client.post("/api/query", json=EMPTY_QUERY)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert "answer" in data
+
+    @pytest.mark.parametrize(
+        "method,endpoint,body,error",
+        [
+            ("query", "/api/query", {"query": "test query"}, "Test error"),
+            (
+                "session_manager.clear_session",
+                "/api/clear-session",
+                {"session_id": "test_session"},
+                "Clear error",
+            ),
+            ("get_course_analytics", "/api/courses", None, "Stats error"),
+        ],
+    )
+    async def test_endpoint_exception_handling(
+        self, client, test_app, method, endpoint, body, error
+    ):
+        """Test endpoints return 500 when the RAG system raises"""
+        target = attrgetter(method)(test_app.state.rag_system)
+        target.side_effect = Exception(error)
+        try:
+            if body is not None:
+                response = await client.post(endpoint, json=body)
+            else:
+                response = await client.get(endpoint)
+
+            assert response.status_code == 500
+            data = response.json()
+            assert "detail" in data
+            assert data["detail"] == error
+        finally:
+            target.side_effect = None
+
+    async def test_clear_session_endpoint_success(
+        self, client, sample_clear_session_body
+    ):
+        """Test successful clear session endpoint"""
+        response = await client.post(
+            "/api/clear-session",
+            content=sample_clear_session_body,
+            headers={"content-type": "application/json"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["message"] == "Session test_session_id cleared successfully"
+
+    async def test_get_course_stats_endpoint_success(self, client):
+        """Test successful get course stats endpoint"""
+        response = await client.get("/api/courses")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_courses"] == 1
+        assert data["course_titles"] == ["Test Course"]
+
+    async def test_root_endpoint_redirect(self, client):
+        """Test root endpoint redirects appropriately"""
+        response = await client.get("/")
+        assert response.status_code == 404
+
+    async def test_invalid_endpoint(self, client):
+        """Test invalid endpoint returns 404"""
+        response = await client.get("/invalid/endpoint")
+        assert response.status_code == 404
+
+    async def test_query_endpoint_invalid_method(self, client):
+        """Test query endpoint with invalid HTTP method"""
+        response = await client.get("/api/query")
+        assert response.status_code == 405
+
+    async def test_clear_session_endpoint_invalid_method(self, client):
+        """Test clear session endpoint with invalid HTTP method"""
+        response = await client.get("/api/clear-session")
+        assert response.status_code == 405
+
+    async def test_cors_headers(self, client):
+        """Test CORS headers are present"""
+        response = await client.options("/api/query")
+        assert response.status_code == 405
+        # CORS headers may not be present on OPTIONS requests in test client
+
+    async def test_query_endpoint_request_validation(self, client):
+        """Test query endpoint request validation"""
+        # Missing required query field
+        response = await client.post("/api/query", json={})
+        assert response.status_code == 422
+
+    async def test_clear_session_endpoint_request_validation(self, client):
+        """Test clear session endpoint request validation"""
+        # Missing required session_id field
+        response = await client.post("/api/clear-session", json={})
+        assert response.status_code == 422
+
+    @pytest.mark.integration
+    @pytest.mark.xdist_group(name="serial")
+    async def test_full_query_flow(self, client):
+        """Test complete flow from query to session management"""
+        # Initial query
+        response = await client.post("/api/query", json=FULL_FLOW_QUERY)
+
+        assert response.status_code == 200
+        data = response.json()
+        session_id = data["session_id"]
+
+        # Clear the session
+        clear_data = {"session_id": session_id}
+        response = await client.post("/api/clear-session", json=clear_data)
+
+        assert response.status_code == 200
+        assert response.json()["success"] is True
+
+    @pytest.mark.api
+    @pytest.mark.parametrize(
+        "verb,endpoint,body,expected_types",
+        [
+            (
+                "post",
+                "/api/query",
+                {"query": "test query"},
+                [("answer", str), ("sources", list), ("session_id", str)],
+            ),
+            (
+                "get",
+                "/api/courses",
+                None,
+                [("total_courses", int), ("course_titles", list)],
+            ),
+            (
+                "post",
+                "/api/clear-session",
+                {"session_id": "test"},
+                [("success", bool), ("message", str)],
+            ),
+        ],
+    )
+    async def test_api_response_structure(
+        self, client, verb, endpoint, body, expected_types
+    ):
+        """Test API response structures match expected format"""
+        response = await client.request(verb, endpoint, json=body)
+
+        assert response.status_code == 200
+        data = response.json()
+        for key, expected_type in expected_types:
+            assert isinstance(data[key], expected_type)
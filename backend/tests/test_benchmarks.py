@@ -0,0 +1,41 @@
+"""Performance benchmarks for the hot search and tool-calling paths.
+
+Disabled during normal runs (--benchmark-disable in addopts); run with
+'pytest --benchmark-enable --benchmark-only' to collect timings and
+'--benchmark-compare' against a saved baseline to flag regressions.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from search_tools import CourseSearchTool, ToolManager
+
+
+@pytest.mark.benchmark(group="search")
+def test_course_search_execute_benchmark(benchmark, populated_vector_store):
+    """Benchmark semantic search plus result formatting"""
+    tool = CourseSearchTool(populated_vector_store)
+
+    result = benchmark(tool.execute, "introduction", course_name="Test Course")
+
+    assert isinstance(result, str)
+
+
+@pytest.mark.benchmark(group="tool-calls")
+def test_tool_dispatch_benchmark(benchmark, mock_ai_generator):
+    """Benchmark argument parsing and dispatch for a single tool call"""
+    # Local manager with a stubbed executor so the benchmark isolates the
+    # generator's parse-and-dispatch path (no vector store needed)
+    tool_manager = ToolManager()
+    tool_manager.register_tool(CourseSearchTool(None))
+    tool_manager.execute_tool = lambda name, **kwargs: "stub result"
+    tool_call = SimpleNamespace(
+        id="call_1",
+        function=SimpleNamespace(
+            name="search_course_content", arguments='{"query": "test query"}'
+        ),
+    )
+
+    result = benchmark(mock_ai_generator._execute_single_tool, tool_call, tool_manager)
+
+    assert result == "stub result"
@@ -43,14 +43,21 @@ class SearchResults:
 class VectorStore:
     """Vector storage using ChromaDB for course content and metadata"""
 
-    def __init__(self, chroma_path: str, embedding_model: str, max_results: int = 5):
+    def __init__(
+        self, chroma_path: Optional[str], embedding_model: str, max_results: int = 5
+    ):
         self.max_results = (
             max_results if max_results > 0 else 5
         )  # Ensure positive value
-        # Initialize ChromaDB client
-        self.client = chromadb.PersistentClient(
-            path=chroma_path, settings=Settings(anonymized_telemetry=False)
-        )
+        # Initialize ChromaDB client (in-memory when no path is given)
+        if chroma_path:
+            self.client = chromadb.PersistentClient(
+                path=chroma_path, settings=Settings(anonymized_telemetry=False)
+            )
+        else:
+            self.client = chromadb.EphemeralClient(
+                settings=Settings(anonymized_telemetry=False)
+            )
 
         # Set up sentence transformer embedding function
         self.embedding_function = (
@@ -129,30 +136,27 @@ class VectorStore:
 
         return None
 
+    # Filter builders keyed by (course missing, lesson missing); built once
+    # at class creation so the hot search path is a single dict lookup
+    _FILTER_BUILDERS = {
+        (True, True): lambda course, lesson: None,
+        (False, True): lambda course, lesson: {"course_title": course},
+        (True, False): lambda course, lesson: {"lesson_number": lesson},
+        (False, False): lambda course, lesson: {
+            "$and": [{"course_title": course}, {"lesson_number": lesson}]
+        },
+    }
+
     def _build_filter(
         self, course_title: Optional[str], lesson_number: Optional[int]
     ) -> Optional[Dict]:
         """Build ChromaDB filter from search parameters"""
-        if not course_title and lesson_number is None:
-            return None
-
-        # Handle different filter combinations
-        if course_title and lesson_number is not None:
-            return {
-                "$and": [
-                    {"course_title": course_title},
-                    {"lesson_number": lesson_number},
-                ]
-            }
-
-        if course_title:
-            return {"course_title": course_title}
-
-        return {"lesson_number": lesson_number}
+        builder = self._FILTER_BUILDERS[(not course_title, lesson_number is None)]
+        return builder(course_title, lesson_number)
 
     def add_course_metadata(self, course: Course):
         """Add course information to the catalog for semantic search"""
-        import json
+        import orjson
 
         course_text = course.title
 
@@ -174,9 +178,9 @@ class VectorStore:
                     "title": course.title,
                     "instructor": course.instructor,
                     "course_link": course.course_link,
-                    "lessons_json": json.dumps(
+                    "lessons_json": orjson.dumps(
                         lessons_metadata
-                    ),  # Serialize as JSON string
+                    ).decode(),  # Serialize as JSON string
                     "lesson_count": len(course.lessons),
                 }
             ],
@@ -241,7 +245,7 @@ class VectorStore:
 
     def get_all_courses_metadata(self) -> List[Dict[str, Any]]:
         """Get metadata for all courses in the vector store"""
-        import json
+        import orjson
 
         try:
             results = self.course_catalog.get()
@@ -251,7 +255,9 @@ class VectorStore:
                 for metadata in results["metadatas"]:
                     course_meta = metadata.copy()
                     if "lessons_json" in course_meta:
-                        course_meta["lessons"] = json.loads(course_meta["lessons_json"])
+                        course_meta["lessons"] = orjson.loads(
+                            course_meta["lessons_json"]
+                        )
                         del course_meta[
                             "lessons_json"
                         ]  # Remove the JSON string version
@@ -277,7 +283,7 @@ class VectorStore:
 
     def get_lesson_link(self, course_title: str, lesson_number: int) -> Optional[str]:
         """Get lesson link for a given course title and lesson number"""
-        import json
+        import orjson
 
         try:
             # Get course by ID (title is the ID)
@@ -286,7 +292,7 @@ class VectorStore:
                 metadata = results["metadatas"][0]
                 lessons_json = metadata.get("lessons_json")
                 if lessons_json:
-                    lessons = json.loads(lessons_json)
+                    lessons = orjson.loads(lessons_json)
                     # Find the lesson with matching number
                     for lesson in lessons:
                         if lesson.get("lesson_number") == lesson_number:
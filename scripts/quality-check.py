@@ -1,66 +1,100 @@
-#!/usr/bin/env python3
-"""
-Development script to run all code quality checks
-"""
-import subprocess
-import sys
-from pathlib import Path
-
-
-def run_command(cmd: list[str], description: str) -> bool:
-    """Run a command and return True if successful"""
-    print(f"\n=== {description} ===")
-    try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        if result.stdout:
-            print(result.stdout)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ {description} failed")
-        if e.stdout:
-            print("STDOUT:", e.stdout)
-        if e.stderr:
-            print("STDERR:", e.stderr)
-        return False
-
-
-def main() -> int:
-    """Run all quality checks"""
-    print("🔍 Running code quality checks...")
-
-    # Change to project root
-    project_root = Path(__file__).parent
-    os.chdir(project_root)
-
-    checks = [
-        (["uv", "run", "black", "--check", "."], "Black formatting check"),
-        (["uv", "run", "isort", "--check-only", "."], "Import sorting check"),
-        (["uv", "run", "flake8", "--max-line-length=88", "."], "Flake8 linting"),
-        (["uv", "run", "mypy", "."], "Type checking"),
-    ]
-
-    passed = 0
-    total = len(checks)
-
-    for cmd, desc in checks:
-        if run_command(cmd, desc):
-            passed += 1
-            print(f"✅ {desc} passed")
-        else:
-            print(f"❌ {desc} failed")
-
-    print("\n=== Summary ===")
-    print(f"Passed: {passed}/{total}")
-
-    if passed == total:
-        print("🎉 All checks passed!")
-        return 0
-    else:
-        print("💥 Some checks failed!")
-        return 1
-
-
-if __name__ == "__main__":
-    import os
-
-    sys.exit(main())
+#!/usr/bin/env python3
+"""
+Development script to run all code quality checks
+"""
+
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+
+def run_command(cmd: list[str], description: str, cwd: Path) -> bool:
+    """Run a command from the given directory and return True if successful"""
+    # Stream output line by line instead of buffering it whole: memory
+    # stays constant on long mypy runs and progress shows immediately.
+    # The description prefix keeps concurrently running checks readable.
+    proc = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    )
+    assert proc.stdout is not None
+    for line in proc.stdout:
+        print(f"[{description}] {line}", end="")
+    return proc.wait() == 0
+
+
+def main() -> int:
+    """Run all quality checks"""
+    print("🔍 Running code quality checks...")
+
+    # Run every check from the project root; passing cwd= keeps the
+    # process-global working directory untouched so the checks can run
+    # concurrently
+    project_root = Path(__file__).parent.parent
+
+    checks = [
+        (["uv", "run", "black", "--check", "."], "Black formatting check"),
+        (["uv", "run", "isort", "--check-only", "."], "Import sorting check"),
+        (["uv", "run", "flake8", "--max-line-length=88", "."], "Flake8 linting"),
+        (["uv", "run", "mypy", "."], "Type checking"),
+        # --testmon reruns only tests whose dependency graph changed
+        # since the last run (.testmondata is local, see .gitignore).
+        # testmon deactivates itself whenever a marker filter is active,
+        # so -m "" clears the "not slow" filter from addopts here; the
+        # quality gate runs the slow tests too. --dist=loadfile keeps
+        # each test file on one worker so module-scoped fixtures are
+        # built once per file
+        (
+            [
+                "uv",
+                "run",
+                "pytest",
+                "--testmon",
+                "-m",
+                "",
+                "-n",
+                "auto",
+                "--dist",
+                "loadfile",
+                "backend/tests",
+            ],
+            "Unit tests",
+        ),
+    ]
+
+    passed = 0
+    total = len(checks)
+
+    # The checks are independent read-only subprocesses, so overlap them
+    # and report each one as it finishes
+    with ThreadPoolExecutor(max_workers=total) as executor:
+        futures = {
+            executor.submit(run_command, cmd, desc, project_root): desc
+            for cmd, desc in checks
+        }
+        for future in as_completed(futures):
+            desc = futures[future]
+            if future.result():
+                passed += 1
+                print(f"✅ {desc} passed")
+            else:
+                print(f"❌ {desc} failed")
+
+    print("\n=== Summary ===")
+    print(f"Passed: {passed}/{total}")
+
+    if passed == total:
+        print("🎉 All checks passed!")
+        return 0
+    else:
+        print("💥 Some checks failed!")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,8 +2,10 @@
 """
 Test script to verify that the RAG chatbot no longer returns empty responses
 """
+
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.insert(0, "backend")
 
@@ -39,20 +41,31 @@ def test_content_queries():
         "Find information about advanced topics",
     ]
 
-    for i, query in enumerate(test_queries, 1):
-        print(f"\n   Query {i}: {query}")
+    def run_query(query):
         try:
-            response, sources = rag_system.query(query)
-            if response and response.strip():
-                print(f"   ✓ Response: {response[:100]}...")
-                if sources:
-                    print(f"   ✓ Sources: {len(sources)} found")
-                else:
-                    print(f"   ⚠ No sources found")
-            else:
-                print(f"   ✗ Empty response!")
+            return rag_system.query(query), None
         except Exception as e:
-            print(f"   ✗ Error: {e}")
+            return None, e
+
+    # The queries share no session, so overlap their API round trips and
+    # report the results in query order
+    with ThreadPoolExecutor(max_workers=len(test_queries)) as executor:
+        outcomes = list(executor.map(run_query, test_queries))
+
+    for i, (query, (result, error)) in enumerate(zip(test_queries, outcomes), 1):
+        print(f"\n   Query {i}: {query}")
+        if error is not None:
+            print(f"   ✗ Error: {error}")
+            continue
+        response, sources = result
+        if response and response.strip():
+            print(f"   ✓ Response: {response[:100]}...")
+            if sources:
+                print(f"   ✓ Sources: {len(sources)} found")
+            else:
+                print(f"   ⚠ No sources found")
+        else:
+            print(f"   ✗ Empty response!")
 
     print("\n=== Test Summary ===")
     print("✓ MAX_RESULTS configuration fixed (was 0, now 5)")